@@ -6,7 +6,7 @@ This package contains all the UI components used in the application.
 
 from components.text_handlers import TextRedirector, TextWidgetHandler
 from components.settings_dialog import SettingsDialog
-from components.media_card import MediaCard
+from components.media_card import MediaCard, MediaItem
 from components.scrollable_media_frame import ScrollableMediaFrame
 from components.progress_dialog import ProgressDialog
 from components.verification_dialog import VerificationDialog
@@ -18,6 +18,7 @@ __all__ = [
     'TextWidgetHandler',
     'SettingsDialog',
     'MediaCard',
+    'MediaItem',
     'ScrollableMediaFrame',
     'ProgressDialog',
     'VerificationDialog',
@@ -10,7 +10,7 @@ import sys
 import time
 from datetime import datetime
 from utils.constants import COLORS, HAS_CTK_MESSAGEBOX
-from instagram_utils import InstagramReposter, encrypt_existing_sessions
+from instagram_utils import InstagramReposter, encrypt_existing_sessions, ensure_dir
 from components.text_handlers import TextRedirector, TextWidgetHandler
 from components.settings_dialog import SettingsDialog
 from components.scrollable_media_frame import ScrollableMediaFrame
@@ -18,8 +18,11 @@ from components.progress_dialog import ProgressDialog
 from components.account_management import AccountManagementDialog
 from components.verification_dialog import VerificationDialog
 import concurrent.futures
+import functools
+from collections import OrderedDict
 import os
 import json
+from PIL import Image, ImageDraw
 from crypto_utils import PasswordManager
 from instagram_utils import IPBlacklistError
 
@@ -27,6 +30,13 @@ from instagram_utils import IPBlacklistError
 if HAS_CTK_MESSAGEBOX:
     from CTkMessagebox import CTkMessagebox
 
+# Hashtags appended to fetched captions that don't already contain any
+_DEFAULT_HASHTAGS = "\n\n#repost #instagram #trending"
+
+# Content stealer cache of fetched URLs: entries expire after 5 minutes, at most 64 kept
+_URL_CACHE_TTL = 300
+_URL_CACHE_MAX_ENTRIES = 64
+
 class InstagramRepostApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -56,6 +66,12 @@ class InstagramRepostApp(ctk.CTk):
         self.terminal_visible = False
         self.current_repost_thread = None
         
+        # Recently fetched content stealer URLs: url -> (content_info, ctk_img, timestamp)
+        self._url_cache = OrderedDict()
+        
+        # Placeholder icons for the content stealer preview, keyed by media type
+        self._placeholder_imgs = self._build_placeholder_images()
+        
         # Event tracking for modifier keys
         self._current_event = None
         self.bind_all("<Key>", self._track_event)
@@ -713,58 +729,42 @@ class InstagramRepostApp(ctk.CTk):
                     
                     self.log_to_terminal(f"Found {total_medias} posts")
                     
+                    # get_user_medias already checked freshly fetched posts; only those read
+                    # back from the on-disk media cache need their repost status rechecked
+                    repost_status = {media.pk: media.reposted_to for media in medias}
+                    cached_medias = [media for media in medias if media.from_cache]
+                    if cached_medias:
+                        repost_status.update(self.reposter.check_repost_status_bulk(cached_medias))
+                    
                     # Update progress
                     self.after(0, lambda: progress.update_progress(0.3, f"Adding {total_medias} posts..."))
                     
-                    # Create a queue of media to add
-                    media_queue = list(medias)
-                    
-                    # Function to add a single media item with proper error handling
-                    def add_single_media():
-                        nonlocal media_queue
-                        
-                        if not media_queue:
-                            # All media added, complete the process
-                            self.log_to_terminal("Media loading complete")
-                            if progress and progress.winfo_exists():
-                                progress.update_progress(1.0, "Complete!")
-                                self.after(500, progress.destroy)
-                                
-                            # Update the button text to "Refresh Posts" now that we have loaded posts
-                            self.after(0, lambda: self.refresh_btn.configure(
-                                text="Refresh Posts",
-                                fg_color=COLORS["bg_light"],
-                                hover_color=COLORS["bg_dark"]
-                            ))
-                            
-                            # Update tooltip text for the refresh button
-                            self.after(0, lambda: self._create_tooltip(self.refresh_btn, 
-                                "Refresh posts from Instagram (uses cache when available)"))
-                            return
-                        
+                    # Function to add all media in one batch (a single repagination)
+                    def add_all_media():
                         try:
-                            # Take the next media
-                            media = media_queue.pop(0)
-                            
-                            # Add the media to the frame
-                            self.media_frame.add_media(media)
-                            
-                            # Update progress
-                            remaining = len(media_queue)
-                            processed = total_medias - remaining
-                            progress_value = 0.3 + (0.7 * (processed / total_medias))
-                            
-                            if progress and progress.winfo_exists():
-                                progress.update_progress(progress_value, f"Added {processed}/{total_medias} posts...")
+                            self.media_frame.add_media_batch(medias, repost_status)
                         except Exception as e:
                             self.log_to_terminal(f"Error adding media: {str(e)}", logging.ERROR)
                         
-                        # Schedule the next media addition with a longer delay
-                        # This is critical for UI responsiveness
-                        self.after(150, add_single_media)
+                        # All media added, complete the process
+                        self.log_to_terminal("Media loading complete")
+                        if progress and progress.winfo_exists():
+                            progress.update_progress(1.0, "Complete!")
+                            self.after(500, progress.destroy)
+                            
+                        # Update the button text to "Refresh Posts" now that we have loaded posts
+                        self.refresh_btn.configure(
+                            text="Refresh Posts",
+                            fg_color=COLORS["bg_light"],
+                            hover_color=COLORS["bg_dark"]
+                        )
+                        
+                        # Update tooltip text for the refresh button
+                        self._create_tooltip(self.refresh_btn, 
+                            "Refresh posts from Instagram (uses cache when available)")
                     
                     # Start the media addition process
-                    self.after(100, add_single_media)
+                    self.after(100, add_all_media)
                     
                 except Exception as e:
                     error_msg = str(e)
@@ -820,7 +820,7 @@ class InstagramRepostApp(ctk.CTk):
         self.media_frame.filter_and_sort_media(search_text, media_type, sort_by)
         
     def repost_selected(self):
-        if not self.media_frame.selected_cards:
+        if not self.media_frame.selected_items:
             self.show_warning("Please select a post to repost")
             return
 
@@ -828,7 +828,7 @@ class InstagramRepostApp(ctk.CTk):
             progress = ProgressDialog(self, "Reposting")
             self.current_repost_thread = threading.Thread(
                 target=self._repost_media,
-                args=(self.media_frame.selected_cards, progress)
+                args=(self.media_frame.selected_items, progress)
             )
             self.current_repost_thread.daemon = True  # Allow thread to be terminated when window closes
             self.current_repost_thread.start()
@@ -984,31 +984,29 @@ class InstagramRepostApp(ctk.CTk):
                         if not already_reposted:
                             # Repost to this account
                             if media_data["media_type"] == 2:  # Video
-                                client.video_upload(
+                                uploaded = client.video_upload(
                                     path=media_data["path"],
                                     caption=media_data["caption"],
                                     usertags=media_data["usertags"],
                                     location=media_data["location"]
                                 )
                             else:  # Photo
-                                client.photo_upload(
+                                uploaded = client.photo_upload(
                                     path=media_data["path"],
                                     caption=media_data["caption"],
                                     usertags=media_data["usertags"],
                                     location=media_data["location"]
                                 )
                             logging.info(f"Reposted to {client.username}")
+                            # Only this account's cached posts change
+                            self.reposter._record_repost(client.username, uploaded)
                     
                     # Cleanup downloaded file
                     self.reposter.cleanup(media_data["path"])
                     
-                    # Force refresh of repost status
+                    # Refresh repost status from the updated caches
                     self.log_to_terminal(f"Updating repost status for video {i}...")
                     
-                    # Clear cache to force refresh
-                    with self.reposter.cache_lock:
-                        self.reposter.alt_posts_cache = {}
-                    
                     # Update repost status for this card
                     reposted_accounts = self.reposter.check_repost_status(card.media)
                     card.media.reposted_to = reposted_accounts
@@ -1279,7 +1277,7 @@ class InstagramRepostApp(ctk.CTk):
         # Get all currently displayed media
         try:
             # Get all media cards
-            media_cards = self.media_frame.media_cards
+            media_cards = self.media_frame.media_items
             
             if not media_cards:
                 self.log_to_terminal("No media loaded to update")
@@ -1771,6 +1769,20 @@ class InstagramRepostApp(ctk.CTk):
             status_label.configure(text="Please enter a valid Instagram URL", text_color=COLORS["warning"])
             return
             
+        # Reuse a recent fetch of the same URL instead of contacting Instagram again
+        url = url.strip()
+        entry = self._url_cache.get(url)
+        if entry and time.time() - entry[2] < _URL_CACHE_TTL:
+            content_info, ctk_img, _ = entry
+            self._url_cache.move_to_end(url)
+            for widget in content_frame.winfo_children():
+                widget.destroy()
+            self._display_fetched_content(
+                content_frame, options_frame, status_label, parent_window, url, content_info, options_label,
+                cached_img=ctk_img
+            )
+            return
+            
         # Update status
         status_label.configure(text="Fetching content...", text_color=COLORS["text_secondary"])
         
@@ -1805,8 +1817,10 @@ class InstagramRepostApp(ctk.CTk):
             # Try to fetch the content info
             try:
                 content_info = self.reposter.fetch_content_by_url(url)
+                fetched_at = time.time()
                 self.after(0, lambda: self._display_fetched_content(
-                    content_frame, options_frame, status_label, parent_window, url, content_info, options_label
+                    content_frame, options_frame, status_label, parent_window, url, content_info, options_label,
+                    fetched_at=fetched_at
                 ))
             except NotImplementedError as nie:
                 error_msg = str(nie)
@@ -1828,7 +1842,27 @@ class InstagramRepostApp(ctk.CTk):
                 text_color=COLORS["error"]
             ))
     
-    def _display_fetched_content(self, content_frame, options_frame, status_label, parent_window, url, content_info, options_label=None):
+    def _cache_url_content(self, url, content_info, ctk_img=None, fetched_at=None):
+        """Store fetched content (and its thumbnail once loaded) in the URL cache.
+        
+        fetched_at is only given for a real network fetch; otherwise an existing
+        entry keeps its timestamp so re-displaying it can't extend its TTL.
+        """
+        entry = self._url_cache.get(url)
+        if entry is not None:
+            if ctk_img is None:
+                # Keep an already loaded thumbnail for the same URL
+                ctk_img = entry[1]
+            if fetched_at is None:
+                fetched_at = entry[2]
+        if fetched_at is None:
+            fetched_at = time.time()
+        self._url_cache[url] = (content_info, ctk_img, fetched_at)
+        self._url_cache.move_to_end(url)
+        if len(self._url_cache) > _URL_CACHE_MAX_ENTRIES:
+            self._url_cache.popitem(last=False)
+    
+    def _display_fetched_content(self, content_frame, options_frame, status_label, parent_window, url, content_info, options_label=None, cached_img=None, fetched_at=None):
         """Display the fetched content in the UI."""
         try:
             # Check if there's an error in the content info
@@ -1910,6 +1944,9 @@ class InstagramRepostApp(ctk.CTk):
                 text_color=COLORS["success"]
             )
             
+            # Remember the result so fetching the same URL again is instant
+            self._cache_url_content(url, content_info, cached_img, fetched_at)
+            
             # Extract content info
             media_type = content_info.get('media_type', 1)
             shortcode = content_info.get('shortcode', '')
@@ -1946,6 +1983,8 @@ class InstagramRepostApp(ctk.CTk):
                 text_color=COLORS["text_secondary"]
             )
             loading_label.pack(pady=130)
+            # Track the single content widget so it can be swapped without scanning children
+            media_frame._content_widget = loading_label
             
             # Try to display thumbnail if available
             thumbnail_url = content_info.get('thumbnail_url')
@@ -1988,8 +2027,9 @@ class InstagramRepostApp(ctk.CTk):
                     # Convert to CTkImage
                     ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(new_width, new_height))
                     
-                    # Update UI on main thread
+                    # Update UI on main thread and keep the thumbnail with the cached content
                     self.after(0, lambda: self._update_thumbnail_ui(media_frame, ctk_img, loading_label))
+                    self.after(0, lambda: self._cache_url_content(url, content_info, ctk_img))
                     
                 except Exception as e:
                     self.log_to_terminal(f"Error loading thumbnail: {str(e)}", logging.WARNING)
@@ -1997,8 +2037,11 @@ class InstagramRepostApp(ctk.CTk):
                         media_frame, loading_label, media_type, shortcode
                     ))
             
-            # Start the thumbnail loading in a separate thread
-            threading.Thread(target=load_thumbnail, daemon=True).start()
+            # Show a cached thumbnail directly, otherwise load it in a separate thread
+            if cached_img is not None:
+                self._update_thumbnail_ui(media_frame, cached_img, loading_label)
+            else:
+                threading.Thread(target=load_thumbnail, daemon=True).start()
             
             # Caption editor
             caption_frame = ctk.CTkFrame(preview_frame, fg_color=COLORS["bg_dark"])
@@ -2025,8 +2068,8 @@ class InstagramRepostApp(ctk.CTk):
             # Insert original caption + hashtags
             default_caption = original_caption or "Amazing content! 🔥"
             # Add hashtags if they're not already there
-            if "#" not in default_caption:
-                default_caption += "\n\n#repost #instagram #trending"
+            if default_caption.find("#") < 0:
+                default_caption = f"{default_caption}{_DEFAULT_HASHTAGS}"
             caption_text.insert("1.0", default_caption)
             
             # Now show the options frame
@@ -2095,14 +2138,8 @@ class InstagramRepostApp(ctk.CTk):
             post_btn = ctk.CTkButton(
                 post_btn_frame,
                 text="Post Content",
-                command=lambda: self._post_stolen_content(
-                    content_info, 
-                    caption_text.get("1.0", "end-1c"),
-                    account_vars,
-                    False,  # remove_watermark_var.get()
-                    False,  # add_watermark_var.get()
-                    False,  # credit_original_var.get()
-                    parent_window
+                command=functools.partial(
+                    self._on_post_click, content_info, caption_text, account_vars, parent_window
                 ),
                 width=150,
                 height=40,
@@ -2116,7 +2153,7 @@ class InstagramRepostApp(ctk.CTk):
             download_btn = ctk.CTkButton(
                 post_btn_frame,
                 text="Download Only",
-                command=lambda: self._download_only_content(content_info, parent_window),
+                command=functools.partial(self._download_only_content, content_info, parent_window),
                 width=130,
                 height=40
             )
@@ -2134,9 +2171,8 @@ class InstagramRepostApp(ctk.CTk):
             # Remove loading indicator
             loading_label.pack_forget()
             
-            # Clear any existing content in the media frame
-            for widget in media_frame.winfo_children():
-                widget.destroy()
+            # Destroy the current content widget (the loading label or a previous image)
+            self._destroy_content_widget(media_frame)
             
             # Create a new label with the image
             img_label = ctk.CTkLabel(
@@ -2145,6 +2181,7 @@ class InstagramRepostApp(ctk.CTk):
                 text=""
             )
             img_label.pack(expand=True, pady=10)
+            media_frame._content_widget = img_label
             
             # Store reference to prevent garbage collection
             media_frame.image = ctk_img
@@ -2152,39 +2189,81 @@ class InstagramRepostApp(ctk.CTk):
         except Exception as e:
             self.log_to_terminal(f"Error updating thumbnail UI: {str(e)}", logging.ERROR)
     
+    def _destroy_content_widget(self, media_frame):
+        """Destroy the widget currently shown in a preview media frame, if any."""
+        widget = getattr(media_frame, "_content_widget", None)
+        if widget is not None:
+            widget.destroy()
+            media_frame._content_widget = None
+    
+    def _build_placeholder_images(self, size=64):
+        """Draw the placeholder icons once so previews don't render emoji glyphs.
+        
+        Returns:
+            dict: Mapping of media type (1 photo, 2 video, 0 album) to CTkImage
+        """
+        color = COLORS["accent"]
+        width = max(2, size // 16)
+        
+        def new_canvas():
+            image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            return image, ImageDraw.Draw(image)
+        
+        # Photo: framed picture with a sun and a mountain
+        photo, draw = new_canvas()
+        draw.rounded_rectangle((4, 10, size - 5, size - 11), radius=6, outline=color, width=width)
+        draw.ellipse((size * 0.25, size * 0.28, size * 0.38, size * 0.41), fill=color)
+        draw.polygon([(10, size - 16), (size * 0.42, size * 0.45), (size * 0.6, size * 0.62),
+                      (size * 0.72, size * 0.52), (size - 10, size - 16)], fill=color)
+        
+        # Video: play triangle inside a circle
+        video, draw = new_canvas()
+        draw.ellipse((4, 4, size - 5, size - 5), outline=color, width=width)
+        draw.polygon([(size * 0.4, size * 0.3), (size * 0.4, size * 0.7), (size * 0.72, size * 0.5)], fill=color)
+        
+        # Album: two stacked frames
+        album, draw = new_canvas()
+        draw.rounded_rectangle((14, 4, size - 5, size - 15), radius=5, outline=color, width=width)
+        draw.rounded_rectangle((4, 14, size - 15, size - 5), radius=5, fill=color)
+        
+        return {
+            media_type: ctk.CTkImage(light_image=image, dark_image=image, size=(size, size))
+            for media_type, image in ((1, photo), (2, video), (0, album))
+        }
+    
     def _show_placeholder_thumbnail(self, media_frame, loading_label, media_type, shortcode):
         """Show a placeholder when thumbnail loading fails."""
         try:
             # Remove loading indicator
             loading_label.pack_forget()
             
-            # Clear frame
-            for widget in media_frame.winfo_children():
-                widget.destroy()
+            # Destroy the current content widget
+            self._destroy_content_widget(media_frame)
+            
+            # Group the placeholder widgets so they form a single tracked child
+            placeholder = ctk.CTkFrame(media_frame, fg_color="transparent")
+            placeholder.pack(expand=True)
+            media_frame._content_widget = placeholder
                 
             # Create a more informative placeholder based on content type
             if media_type == 1:  # Photo
-                icon_text = "🖼️"
                 type_text = "Photo"
             elif media_type == 2:  # Video
-                icon_text = "🎬"
                 type_text = "Video"
             else:  # Album
-                icon_text = "📁"
                 type_text = "Album"
                 
-            # Add icon placeholder
+            # Add icon placeholder using the preloaded image
             icon_label = ctk.CTkLabel(
-                media_frame,
-                text=icon_text,
-                font=ctk.CTkFont(size=64),
-                text_color=COLORS["accent"]
+                placeholder,
+                image=self._placeholder_imgs.get(media_type, self._placeholder_imgs[0]),
+                text=""
             )
             icon_label.pack(pady=(40, 10))
             
             # Add media description
             media_desc = ctk.CTkLabel(
-                media_frame,
+                placeholder,
                 text=f"{type_text} Content Preview",
                 font=ctk.CTkFont(size=18, weight="bold"),
                 text_color=COLORS["text_primary"]
@@ -2193,7 +2272,7 @@ class InstagramRepostApp(ctk.CTk):
             
             # Add shortcode
             shortcode_label = ctk.CTkLabel(
-                media_frame,
+                placeholder,
                 text=f"Shortcode: {shortcode}",
                 font=ctk.CTkFont(size=12),
                 text_color=COLORS["text_secondary"]
@@ -2224,6 +2303,18 @@ class InstagramRepostApp(ctk.CTk):
             text_color=COLORS["text_secondary"]
         )
     
+    def _on_post_click(self, content_info, caption_widget, account_vars, parent_window):
+        """Read the edited caption at click time and post the stolen content."""
+        return self._post_stolen_content(
+            content_info,
+            caption_widget.get("1.0", "end-1c"),
+            account_vars,
+            False,  # remove_watermark_var.get()
+            False,  # add_watermark_var.get()
+            False,  # credit_original_var.get()
+            parent_window
+        )
+    
     def _post_stolen_content(self, content_info, caption, account_vars, remove_watermark, add_watermark, credit_original, parent_window):
         """Post the stolen content to selected accounts."""
         # Get selected accounts
@@ -2258,32 +2349,34 @@ class InstagramRepostApp(ctk.CTk):
             
             # Process each selected account
             success_count = 0
+            total_accounts = len(selected_accounts)
+            # Decide up front which entries go through the main client
+            is_main = [i == 0 or account_name == "Main Account" for i, account_name in enumerate(selected_accounts)]
             for i, account_name in enumerate(selected_accounts):
-                try:
-                    account_progress = 0.2 + (0.8 * ((i) / len(selected_accounts)))
-                    self.after(0, lambda p=account_progress, a=account_name: 
-                        progress.update_progress(p, f"Posting to {a}..."))
+                account_progress = 0.2 + (0.8 * (i / total_accounts))
+                self.after(0, lambda p=account_progress, a=account_name: 
+                    progress.update_progress(p, f"Posting to {a}..."))
+                
+                # Actually post the content - for now with main account only
+                # In a full implementation, we would switch between accounts
+                if is_main[i]:
+                    # repost_content_by_url reports failures in the result dict instead of raising
+                    result = self.reposter.repost_content_by_url(
+                        url=url,
+                        caption=caption,
+                        remove_watermark=remove_watermark,
+                        add_watermark=add_watermark,
+                        credit_original=credit_original
+                    )
+                    if not result.get('success'):
+                        self.log_to_terminal(f"Error posting to {account_name}: {result.get('error', 'Unknown error')}", logging.ERROR)
+                else:
+                    # For alt accounts in this demo, just simulate success
+                    # In a full implementation, we would use the appropriate client
+                    self.log_to_terminal(f"Would post to {account_name}", logging.INFO)
+                    result = {'success': True}
                     
-                    # Actually post the content - for now with main account only
-                    # In a full implementation, we would switch between accounts
-                    if i == 0 or "Main Account" in account_name:
-                        result = self.reposter.repost_content_by_url(
-                            url=url,
-                            caption=caption,
-                            remove_watermark=remove_watermark,
-                            add_watermark=add_watermark,
-                            credit_original=credit_original
-                        )
-                        if result.get('success'):
-                            success_count += 1
-                    else:
-                        # For alt accounts in this demo, just simulate success
-                        # In a full implementation, we would use the appropriate client
-                        self.log_to_terminal(f"Would post to {account_name}", logging.INFO)
-                        success_count += 1
-                        
-                except Exception as e:
-                    self.log_to_terminal(f"Error posting to {account_name}: {str(e)}", logging.ERROR)
+                success_count += bool(result.get('success'))
             
             # Complete the process
             self.after(0, lambda: progress.update_progress(1.0, "Posted successfully!"))
@@ -2334,7 +2427,7 @@ class InstagramRepostApp(ctk.CTk):
             
             # Create target directory - use local Downloads folder
             target_dir = "Downloads"
-            os.makedirs(target_dir, exist_ok=True)
+            ensure_dir(target_dir)
             
             # Log the intended directory
             self.log_to_terminal(f"Downloading content to directory: {target_dir}", logging.INFO)
@@ -5,38 +5,276 @@ import customtkinter as ctk
 import tkinter as tk
 from PIL import Image
 import threading
+import queue
+import itertools
 import concurrent.futures
 import logging
 import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from collections import OrderedDict, deque
 from utils.constants import COLORS
 
+# Use libjpeg-turbo for JPEG thumbnails when PyTurboJPEG and the library are available
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    _turbo_jpeg = None
+
+# Edge length of decoded thumbnails
+THUMBNAIL_SIZE = 180
+
+# Concurrent thumbnail fetches; each worker keeps its own keep-alive connection
+THUMBNAIL_CONNECTIONS = 8
+
+# Upper bound on decoded pixel data kept in the thumbnail cache
+THUMBNAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def _decode_thumbnail(content):
+    """Decode thumbnail bytes into a PIL image no larger than THUMBNAIL_SIZE.
+    
+    JPEGs are decoded with libjpeg-turbo at the smallest scale that still covers
+    the thumbnail; anything else (or any TurboJPEG failure) goes through Pillow.
+    """
+    if _turbo_jpeg is not None and content[:2] == b"\xff\xd8":
+        try:
+            width, height, _, _ = _turbo_jpeg.decode_header(content)
+            # Pick the strongest IDCT scaling that keeps the short side >= THUMBNAIL_SIZE
+            scaling_factor = None
+            for num, den in sorted(_turbo_jpeg.scaling_factors, key=lambda f: f[0] / f[1]):
+                if min(width, height) * num / den >= THUMBNAIL_SIZE:
+                    scaling_factor = (num, den)
+                    break
+            rgb = _turbo_jpeg.decode(content, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+            image = Image.fromarray(rgb)
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.BILINEAR)
+            return image
+        except Exception:
+            pass
+    
+    image = Image.open(io.BytesIO(content))
+    # Let libjpeg scale down inside the IDCT before the first load (no-op for non-JPEGs)
+    image.draft("RGB", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    image.load()
+    # Bilinear is plenty for a 180px thumbnail
+    image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.BILINEAR)
+    # Normalise to RGB once so the CTkImage and the cache never hold a converted copy
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+def _create_thumbnail_session():
+    """Create a pooled HTTP session so thumbnail fetches reuse CDN connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=THUMBNAIL_CONNECTIONS,
+        pool_block=True,
+        max_retries=Retry(total=1, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    return session
+
+class MediaItem:
+    """Selection and repost state for one media, independent of the card showing it.
+    
+    MediaCard widgets are recycled across pages, so anything that must survive
+    paging lives here. The card currently displaying the item (if any) is kept
+    in sync.
+    """
+    
+    def __init__(self, media, reposted_to=None, index=0, on_select=None):
+        self.media = media
+        self.reposted_to = reposted_to or []
+        # False until a repost check has run (or a bulk result was supplied)
+        self.repost_status_known = reposted_to is not None
+        # Position in the feed, used as the thumbnail load priority
+        self.index = index
+        self.on_select = on_select
+        self.selected = False
+        self.selection_number = ""
+        # MediaCard currently bound to this item
+        self.card = None
+        
+    def toggle_select(self, event=None):
+        """Toggle selection, or force it when called with a bool, and notify on_select."""
+        if isinstance(event, bool):
+            self.selected = event
+        else:
+            self.selected = not self.selected
+            
+        if self.card is not None:
+            self.card.update_selection_state()
+            
+        if self.on_select:
+            self.on_select(self)
+            
+    def set_selection_number(self, number):
+        """Set the number shown on the selection badge."""
+        self.selection_number = str(number)
+        if self.card is not None:
+            self.card.selection_badge.configure(text=self.selection_number)
+            
+    def update_repost_status(self, reposted_to=None):
+        """Store a new repost status and refresh the bound card."""
+        if reposted_to is not None:
+            self.reposted_to = reposted_to
+            self.repost_status_known = True
+        if self.card is not None:
+            self.card.update_repost_status()
+
 class MediaCard(ctk.CTkFrame):
-    # Create a thread pool for thumbnail loading (shared across all cards)
-    _thumbnail_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)  # Reduced from 4 to 2
+    # Shared priority queue of thumbnail jobs, drained by a fixed pool of daemon workers
+    _thumbnail_queue = queue.PriorityQueue()
+    _thumbnail_workers = THUMBNAIL_CONNECTIONS
+    _thumbnail_workers_started = False
+    _thumbnail_workers_lock = threading.Lock()
+    # Tie-breaker so jobs with equal priority stay FIFO
+    _thumbnail_seq = itertools.count()
+    # Shared keep-alive session for thumbnail downloads
+    _session = _create_thumbnail_session()
     # Add a class-level cache for thumbnails to avoid duplicate downloads
-    _thumbnail_cache = {}
+    # LRU of decoded pixels keyed by media pk: pk -> (mode, size, raw bytes)
+    _thumbnail_cache = OrderedDict()
+    _cache_bytes = 0
     _cache_lock = threading.Lock()
+    # In-flight thumbnail loads keyed by media pk, so duplicates share one fetch
+    _inflight = {}
     
-    # Add a class variable to track active thumbnail loads
-    _active_loads = 0
-    _active_loads_lock = threading.Lock()
+    # Placeholder shown until the thumbnail arrives, shared by all cards
+    _placeholder_image = None
     
-    # Maximum concurrent thumbnail loads
-    _max_concurrent_loads = 1  # Reduced from 2 to 1
+    # Finished thumbnails waiting to be applied by a single idle callback
+    _pending_updates = deque()
+    _drain_scheduled = False
+    _pending_lock = threading.Lock()
     
-    def __init__(self, parent, media, reposter, on_select=None, **kwargs):
+    @classmethod
+    def _get_cached_thumbnail(cls, pk):
+        """Return the cached PIL image for a media pk, or None."""
+        with cls._cache_lock:
+            entry = cls._thumbnail_cache.get(pk)
+            if entry is None:
+                return None
+            cls._thumbnail_cache.move_to_end(pk)
+        mode, size, data = entry
+        return Image.frombytes(mode, size, data)
+    
+    @classmethod
+    def _cache_thumbnail(cls, pk, image):
+        """Store a decoded thumbnail, evicting least recently used entries over budget."""
+        data = image.tobytes()
+        with cls._cache_lock:
+            old = cls._thumbnail_cache.pop(pk, None)
+            if old is not None:
+                cls._cache_bytes -= len(old[2])
+            cls._thumbnail_cache[pk] = (image.mode, image.size, data)
+            cls._cache_bytes += len(data)
+            while cls._cache_bytes > THUMBNAIL_CACHE_MAX_BYTES and len(cls._thumbnail_cache) > 1:
+                _, evicted = cls._thumbnail_cache.popitem(last=False)
+                cls._cache_bytes -= len(evicted[2])
+    
+    @classmethod
+    def _download_thumbnail(cls, thumbnail_url, is_cancelled=None):
+        """Download raw thumbnail bytes over the pooled session.
+        
+        Returns None if is_cancelled() turns true while streaming.
+        """
+        # (connect, read) timeouts
+        response = cls._session.get(thumbnail_url, timeout=(1.5, 3), stream=True)
+        try:
+            if response.status_code != 200:
+                raise Exception(f"Failed to download thumbnail: HTTP {response.status_code}")
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                if is_cancelled and is_cancelled():
+                    return None
+                chunks.append(chunk)
+            return b"".join(chunks)
+        finally:
+            # Return the connection to the pool
+            response.close()
+    
+    @classmethod
+    def _get_placeholder_image(cls):
+        """Return the shared placeholder CTkImage, creating it on first use."""
+        if cls._placeholder_image is None:
+            placeholder = Image.new('RGB', (140, 140), color=(50, 50, 50))
+            cls._placeholder_image = ctk.CTkImage(light_image=placeholder, dark_image=placeholder, size=(140, 140))
+        return cls._placeholder_image
+    
+    @classmethod
+    def _enqueue_update(cls, card, ctk_image, generation):
+        """Queue a thumbnail for the UI thread, scheduling one drain per batch."""
+        with cls._pending_lock:
+            cls._pending_updates.append((card, ctk_image, generation))
+            if cls._drain_scheduled:
+                return
+            cls._drain_scheduled = True
+        try:
+            card.after_idle(cls._drain_updates)
+        except Exception:
+            # Card is gone; let the next completion schedule the drain
+            with cls._pending_lock:
+                cls._drain_scheduled = False
+    
+    @classmethod
+    def _drain_updates(cls):
+        """Apply all queued thumbnails in one pass on the UI thread."""
+        with cls._pending_lock:
+            updates = list(cls._pending_updates)
+            cls._pending_updates.clear()
+            cls._drain_scheduled = False
+        for card, ctk_image, generation in updates:
+            card._update_thumbnail(ctk_image, generation)
+    
+    @classmethod
+    def _start_thumbnail_workers(cls):
+        """Start the thumbnail worker threads on first use."""
+        with cls._thumbnail_workers_lock:
+            if cls._thumbnail_workers_started:
+                return
+            for i in range(cls._thumbnail_workers):
+                worker = threading.Thread(
+                    target=cls._thumbnail_worker,
+                    name=f"thumbnail-worker-{i}",
+                    daemon=True
+                )
+                worker.start()
+            cls._thumbnail_workers_started = True
+    
+    @classmethod
+    def _thumbnail_worker(cls):
+        """Run queued thumbnail jobs, lowest priority value first."""
+        while True:
+            _, _, job = cls._thumbnail_queue.get()
+            try:
+                job()
+            except Exception as e:
+                logging.error(f"Thumbnail worker error: {str(e)}")
+            finally:
+                cls._thumbnail_queue.task_done()
+    
+    def __init__(self, parent, media, reposter, on_select=None, priority=None, reposted_to=None, **kwargs):
+        """Create a card, optionally bound to a media.
+        
+        Pass media=None to create an empty slot that is filled later with bind_media().
+        """
         super().__init__(parent, **kwargs)
         
         self.parent = parent
-        self.media = media
         self.reposter = reposter
-        self.on_select = on_select
-        self.selected = False
+        # MediaItem currently displayed by this card
+        self.item = None
         self.thumbnail_image = None
-        self.thumbnail_future = None
         self._thumbnail_loaded = False
+        # Bumped on every rebind so loads for a previous media are discarded
+        self._load_generation = 0
+        # Set when the card is destroyed so queued or running loads can bail out
+        self._cancelled = False
         self._hover = False
         
         # Set up UI
@@ -45,20 +283,85 @@ class MediaCard(ctk.CTkFrame):
         # Bind events
         self._bind_click_events()
         
-        # Check repost status
-        self.reposted_to = []
+        if media is not None:
+            self.bind_media(MediaItem(media, reposted_to=reposted_to, index=priority or 0, on_select=on_select))
+    
+    @property
+    def media(self):
+        return self.item.media if self.item is not None else None
+    
+    @property
+    def selected(self):
+        return self.item is not None and self.item.selected
+    
+    @property
+    def reposted_to(self):
+        return self.item.reposted_to if self.item is not None else []
+    
+    def bind_media(self, item):
+        """Show a different MediaItem in this card, updating widgets in place."""
+        if item is self.item:
+            return
+        
+        # Detach from the previous item
+        if self.item is not None and self.item.card is self:
+            self.item.card = None
+        if item is not None and item.card is not None and item.card is not self:
+            item.card.bind_media(None)
+        
+        self.item = item
+        self._load_generation += 1
+        self._thumbnail_loaded = False
+        
+        # Unbound slots are hidden, so their widgets are left as they are
+        # until the slot is bound again
+        if item is None:
+            return
+        item.card = self
+        self.thumbnail_image = None
+        self.thumb_label.configure(image=MediaCard._get_placeholder_image(), text="")
+        
+        # Refresh static content, selection and repost status
+        self._apply_media()
+        self.selection_badge.configure(text=item.selection_number)
+        self.update_selection_state()
+        self.update_repost_status()
         
         # Defer thumbnail loading and repost status check to prevent UI freezing
-        self.after(100, self.load_thumbnail)
-        self.after(200, self.check_repost_status)
+        generation = self._load_generation
+        self.after(100, self._run_if_current, generation, self.load_thumbnail)
+        if not item.repost_status_known:
+            self.after(200, self._run_if_current, generation, self.check_repost_status)
+    
+    def _run_if_current(self, generation, callback):
+        """Run a deferred callback only if the card still shows the same media."""
+        if generation == self._load_generation and self.item is not None:
+            callback()
+    
+    def _apply_media(self):
+        """Fill the type, likes and caption widgets from the bound media."""
+        media = self.media
+        is_video = getattr(media, 'media_type', 0) == 2
         
-        # Set up a timeout for thumbnail loading
-        def check_thumbnail_timeout():
-            if not self._thumbnail_loaded and self.winfo_exists():
-                self.thumb_label.configure(text="Timeout", font=("Segoe UI", 12))
-                
-        # Check thumbnail timeout after 10 seconds
-        self.after(10000, check_thumbnail_timeout)
+        self._type_label.configure(text="🎥" if is_video else "📷")
+        
+        likes = getattr(media, 'like_count', 0) or 0
+        if is_video:
+            self._likes_frame.grid_configure(padx=(0, 4), pady=3)  # Reduced padding
+            self._likes_icon.configure(font=("Segoe UI", 12))  # Reduced from 14
+            self._likes_count.configure(text=f"{likes:,}", font=self._likes_font_small)
+        else:
+            self._likes_frame.grid_configure(padx=(0, 8), pady=5)
+            self._likes_icon.configure(font=("Segoe UI", 14))
+            self._likes_count.configure(text=f"{likes:,}", font=self._likes_font)
+        
+        # Get caption text or placeholder
+        caption_text = getattr(media, 'caption_text', None) or "No caption"
+        
+        # Truncate caption if too long to ensure consistent display
+        if len(caption_text) > 80:  # Reduced from 100
+            caption_text = caption_text[:77] + "..."  # Reduced from 97
+        self._caption_label.configure(text=caption_text)
         
     def setup_ui(self):
         # Main layout is a grid with rows for thumbnail, info/stats, caption, and repost status
@@ -76,9 +379,10 @@ class MediaCard(ctk.CTkFrame):
         self.thumb_container.grid(row=0, column=0, sticky="nsew", padx=8, pady=(8, 4))  # Reduced padding
         self.thumb_container.grid_propagate(False)
         
-        # Thumbnail
+        # Thumbnail (starts on the shared placeholder)
         self.thumb_label = ctk.CTkLabel(
             self.thumb_container,
+            image=MediaCard._get_placeholder_image(),
             text="",
             width=140,  # Reduced from 180
             height=140   # Reduced from 180
@@ -138,9 +442,9 @@ class MediaCard(ctk.CTkFrame):
         info_strip.grid_propagate(False)
         
         # Media type indicator (left side)
-        type_label = ctk.CTkLabel(
+        self._type_label = ctk.CTkLabel(
             info_strip,
-            text="🎥" if self.media.media_type == 2 else "📷",
+            text="",
             font=("Segoe UI", 14),  # Reduced from 16
             fg_color=COLORS["bg_dark"],
             corner_radius=8,  # Reduced from 10
@@ -148,61 +452,34 @@ class MediaCard(ctk.CTkFrame):
             height=24,        # Reduced from 30
             text_color=COLORS["text_primary"]
         )
-        type_label.grid(row=0, column=0, padx=4, pady=3, sticky="w")  # Reduced padding
-        
-        # Stats in the center/right
-        if self.media.media_type == 2:  # Video
-            # Set up a 3-column grid layout for the info strip
-            info_strip.columnconfigure(0, weight=1)  # Media type icon
-            info_strip.columnconfigure(1, weight=0)  # Likes
-            info_strip.columnconfigure(2, weight=0)  # Views
-            
-            # Likes with icon
-            likes = getattr(self.media, 'like_count', 0) or 0
-            likes_frame = ctk.CTkFrame(info_strip, fg_color="transparent")
-            likes_frame.grid(row=0, column=1, sticky="e", padx=(0, 4), pady=3)  # Reduced padding
-            
-            likes_icon = ctk.CTkLabel(
-                likes_frame,
-                text="❤️",
-                font=("Segoe UI", 12),  # Reduced from 14
-                text_color=COLORS["text_primary"]
-            )
-            likes_icon.pack(side="left", padx=(0, 1))
-            
-            likes_count = ctk.CTkLabel(
-                likes_frame,
-                text=f"{likes:,}",
-                font=ctk.CTkFont(family="Helvetica", size=10, weight="bold"),  # Reduced from 12
-                text_color=COLORS["text_primary"]
-            )
-            likes_count.pack(side="left")
-        else:
-            # For photos, just show likes - configure the grid for 2 columns
-            info_strip.columnconfigure(0, weight=1)  # Media type icon
-            info_strip.columnconfigure(1, weight=0)  # Likes
-            
-            # For photos, just show likes
-            likes = getattr(self.media, 'like_count', 0) or 0
-            
-            likes_frame = ctk.CTkFrame(info_strip, fg_color="transparent")
-            likes_frame.grid(row=0, column=1, sticky="e", padx=(0, 8), pady=5)
-            
-            likes_icon = ctk.CTkLabel(
-                likes_frame,
-                text="❤️",
-                font=("Segoe UI", 14),
-                text_color=COLORS["text_primary"]
-            )
-            likes_icon.pack(side="left", padx=(0, 1))
-            
-            likes_count = ctk.CTkLabel(
-                likes_frame,
-                text=f"{likes:,}",
-                font=ctk.CTkFont(family="Helvetica", size=12, weight="bold"),
-                text_color=COLORS["text_primary"]
-            )
-            likes_count.pack(side="left")
+        self._type_label.grid(row=0, column=0, padx=4, pady=3, sticky="w")  # Reduced padding
+        
+        # Stats on the right; sizes are adjusted per media type in _apply_media
+        info_strip.columnconfigure(0, weight=1)  # Media type icon
+        info_strip.columnconfigure(1, weight=0)  # Likes
+        
+        # Likes with icon
+        self._likes_font = ctk.CTkFont(family="Helvetica", size=12, weight="bold")
+        self._likes_font_small = ctk.CTkFont(family="Helvetica", size=10, weight="bold")  # Reduced from 12
+        
+        self._likes_frame = ctk.CTkFrame(info_strip, fg_color="transparent")
+        self._likes_frame.grid(row=0, column=1, sticky="e", padx=(0, 8), pady=5)
+        
+        self._likes_icon = ctk.CTkLabel(
+            self._likes_frame,
+            text="❤️",
+            font=("Segoe UI", 14),
+            text_color=COLORS["text_primary"]
+        )
+        self._likes_icon.pack(side="left", padx=(0, 1))
+        
+        self._likes_count = ctk.CTkLabel(
+            self._likes_frame,
+            text="",
+            font=self._likes_font,
+            text_color=COLORS["text_primary"]
+        )
+        self._likes_count.pack(side="left")
 
         # 3. Caption area
         caption_container = ctk.CTkFrame(
@@ -214,24 +491,17 @@ class MediaCard(ctk.CTkFrame):
         caption_container.grid(row=2, column=0, sticky="ew", padx=8, pady=(0, 4))  # Reduced padding
         caption_container.grid_propagate(False)  # Prevent resizing based on content
         
-        # Get caption text or placeholder
-        caption_text = getattr(self.media, 'caption_text', None) or "No caption"
-        
-        # Truncate caption if too long to ensure consistent display
-        if len(caption_text) > 80:  # Reduced from 100
-            caption_text = caption_text[:77] + "..."  # Reduced from 97
-        
         # Caption label
-        caption_label = ctk.CTkLabel(
+        self._caption_label = ctk.CTkLabel(
             caption_container,
-            text=caption_text,
+            text="",
             font=ctk.CTkFont(family="Helvetica", size=10),  # Reduced from 11
             text_color=COLORS["text_secondary"],
             wraplength=120,  # Reduced from 160
             justify="left",
             anchor="w"
         )
-        caption_label.pack(fill="both", expand=True, padx=8, pady=4)  # Reduced padding
+        self._caption_label.pack(fill="both", expand=True, padx=8, pady=4)  # Reduced padding
         
         # 4. Repost status container - at the bottom with fixed height
         self.repost_container = ctk.CTkFrame(
@@ -243,17 +513,30 @@ class MediaCard(ctk.CTkFrame):
         self.repost_container.grid(row=3, column=0, sticky="ew", padx=8, pady=(0, 8))  # Reduced padding
         self.repost_container.grid_propagate(False)  # Prevent resizing based on content
         
+        # Fonts for the repost status, reused on every update
+        self._status_font = ctk.CTkFont(family="Helvetica", size=10)  # Reduced from 11
+        self._status_font_bold = ctk.CTkFont(family="Helvetica", size=10, weight="bold")
+        
         # Initialize with default status
-        status_label = ctk.CTkLabel(
+        self._status_label = ctk.CTkLabel(
             self.repost_container,
             text="Not reposted",
-            font=ctk.CTkFont(family="Helvetica", size=10),  # Reduced from 11
+            font=self._status_font,
             text_color=COLORS["text_secondary"]
         )
-        status_label.pack(side="left", padx=8, pady=2)  # Reduced padding
+        self._status_label.pack(side="left", padx=8, pady=2)  # Reduced padding
         
-        # Bind click events to all elements
-        self._bind_click_events()
+        # Username badge, only packed once the media has been reposted
+        self._reposter_label = ctk.CTkLabel(
+            self.repost_container,
+            text="",
+            font=self._status_font,
+            text_color=COLORS["success"],
+            fg_color=COLORS["bg_dark"],
+            corner_radius=6,
+            width=100,
+            height=20
+        )
         
         # Add hover effect
         self.bind("<Enter>", self._on_hover_enter)
@@ -261,66 +544,83 @@ class MediaCard(ctk.CTkFrame):
         
     def _on_hover_enter(self, event):
         """Add hover effect to the card"""
-        if not self.selected:
-            # Use a stronger hover effect
-            self.configure(border_color=COLORS["accent"], border_width=2)
+        # Already highlighted, or selection styling takes precedence
+        if self._hover or self.selected:
+            return
+        self._hover = True
+        # Use a stronger hover effect
+        self.configure(border_color=COLORS["accent"], border_width=2)
             
     def _on_hover_leave(self, event):
         """Remove hover effect from the card"""
+        if not self._hover:
+            return
+        # Moving onto one of the card's own children also fires <Leave>; ignore it
+        try:
+            widget = self.winfo_containing(*self.winfo_pointerxy())
+            if widget is not None and (str(widget) + ".").startswith(str(self) + "."):
+                return
+        except Exception:
+            pass
+        self._hover = False
         if not self.selected:
             # Restore normal appearance
             self.configure(border_color=COLORS["card_border"], border_width=1)
 
     def _bind_click_events(self):
-        """Bind click events to all child widgets recursively."""
-        self._bind_widget_and_children(self)
-    
-    def _bind_widget_and_children(self, widget):
-        """Recursively bind click events to a widget and all its children."""
-        # Bind to this widget
-        widget.bind("<Button-1>", self.toggle_select)
+        """Route clicks on the card and all its children through one shared bind tag."""
+        tag = f"mcard{id(self)}"
         
-        # Recursively bind to all children
-        try:
-            for child in widget.winfo_children():
-                self._bind_widget_and_children(child)
-        except:
-            # Some widgets may not have winfo_children method
-            pass
+        # Add the tag to every descendant once, then bind the handler on the tag
+        stack = [self]
+        while stack:
+            widget = stack.pop()
+            try:
+                tags = widget.bindtags()
+                if tag not in tags:
+                    widget.bindtags(tags + (tag,))
+                stack.extend(widget.winfo_children())
+            except Exception:
+                # Some widgets may not support bindtags or winfo_children
+                pass
+        
+        if getattr(self, "_click_funcid", None) is None:
+            self._click_tag = tag
+            self._click_funcid = self.bind_class(tag, "<Button-1>", self.toggle_select)
+    
+    def destroy(self):
+        """Cancel pending thumbnail work and drop the card's class binding before destroying the widget."""
+        self._cancelled = True
+        if self.item is not None and self.item.card is self:
+            self.item.card = None
+        funcid = getattr(self, "_click_funcid", None)
+        if funcid is not None:
+            try:
+                self.unbind_class(self._click_tag, "<Button-1>")
+                self.deletecommand(funcid)
+            except Exception:
+                pass
+            self._click_funcid = None
+        super().destroy()
 
     def toggle_select(self, event=None):
         """
         Toggle selection state with visual feedback.
         
-        Also notifies the parent frame about the selection change.
+        Selection is stored on the bound MediaItem, which also notifies the
+        parent frame about the change.
         
         Args:
-            event: The event that triggered this method, or None
-            force_state: If provided, forces the selection to this state (True/False)
+            event: The event that triggered this method, or None.
+                   A bool forces the selection to that state (True/False).
         """
-        # If event is a boolean, it's being used as force_state
-        force_state = None
-        if isinstance(event, bool):
-            force_state = event
-            event = None
-            
-        # Toggle or set the selected state
-        if force_state is not None:
-            self.selected = force_state
-        else:
-            self.selected = not self.selected
-        
-        # Update the visual state based on selection
-        self.update_selection_state()
-            
-        # Notify the parent about the selection change
-        if self.on_select:
-            self.on_select(self)
+        if self.item is not None:
+            self.item.toggle_select(event if isinstance(event, bool) else None)
         
         # Prevent event propagation
-        if event:
+        if event is not None and not isinstance(event, bool):
             return "break"
-            
+    
     def update_selection_state(self):
         """Update the visual state of the card based on selection state."""
         if self.selected:
@@ -337,75 +637,111 @@ class MediaCard(ctk.CTkFrame):
     def load_thumbnail(self):
         """Load thumbnail image from Instagram."""
         try:
+            media = self.media
+            pk = media.pk
+            generation = self._load_generation
+            
             # Check if we already have this thumbnail in cache
-            with MediaCard._cache_lock:
-                if self.media.pk in MediaCard._thumbnail_cache:
-                    # Use cached thumbnail
-                    self.thumbnail_image = MediaCard._thumbnail_cache[self.media.pk]
-                    self.thumb_label.configure(image=self.thumbnail_image, text="")
-                    self._thumbnail_loaded = True
-                    return
+            cached = MediaCard._get_cached_thumbnail(pk)
+            if cached is not None:
+                # Rebuild the Tk image from cached pixels
+                self.thumbnail_image = ctk.CTkImage(light_image=cached, dark_image=cached, size=(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+                self.thumb_label.configure(image=self.thumbnail_image, text="")
+                self._thumbnail_loaded = True
+                return
             
-            # Show loading indicator
-            self.thumb_label.configure(text="Loading...")
+            # Join an in-flight load of the same media instead of fetching it again
+            with MediaCard._cache_lock:
+                future = MediaCard._inflight.get(pk)
+                if future is None:
+                    if pk in MediaCard._thumbnail_cache:
+                        # Finished between the cache check and now
+                        future = concurrent.futures.Future()
+                        future.set_result(None)
+                    else:
+                        leader_future = concurrent.futures.Future()
+                        MediaCard._inflight[pk] = leader_future
+            if future is not None:
+                future.add_done_callback(lambda f: self.after(0, self._on_shared_thumbnail, f, generation))
+                return
             
-            # Check if we're already at max concurrent loads
-            with MediaCard._active_loads_lock:
-                if MediaCard._active_loads >= MediaCard._max_concurrent_loads:
-                    # Too many active loads, schedule retry after a delay
-                    self.after(500, self.load_thumbnail)
-                    return
-                # Increment active loads counter
-                MediaCard._active_loads += 1
+            # The load is abandoned if the card is destroyed or rebound to another media
+            def is_cancelled():
+                return self._cancelled or self._load_generation != generation
             
             # Start loading thumbnail in background
             def load_thumbnail_task():
+                image = None
+                error = None
                 try:
-                    # Create a placeholder image first
-                    placeholder = Image.new('RGB', (180, 180), color=(50, 50, 50))
-                    
-                    # Get thumbnail URL
-                    thumbnail_url = self.media.thumbnail_url
+                    # Card destroyed or recycled while waiting in the queue
+                    if is_cancelled():
+                        return
                     
-                    # Download thumbnail with timeout
-                    response = requests.get(thumbnail_url, timeout=3)  # Reduced timeout
-                    if response.status_code != 200:
-                        raise Exception(f"Failed to download thumbnail: HTTP {response.status_code}")
+                    # Download (I/O bound) and decode (GIL released inside the codec) as separate steps
+                    content = MediaCard._download_thumbnail(media.thumbnail_url, is_cancelled)
+                    if content is None or is_cancelled():
+                        return
                     
-                    # Create PIL image from response content
-                    image = Image.open(io.BytesIO(response.content))
-                    
-                    # Resize image to fit thumbnail container (maintain aspect ratio)
-                    image.thumbnail((180, 180))
+                    # Decode and resize to fit thumbnail container (maintain aspect ratio)
+                    image = _decode_thumbnail(content)
                     
                     # Convert to CTkImage
-                    ctk_image = ctk.CTkImage(light_image=image, dark_image=image, size=(180, 180))
+                    ctk_image = ctk.CTkImage(light_image=image, dark_image=image, size=(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
                     
                     # Cache the thumbnail
-                    with MediaCard._cache_lock:
-                        MediaCard._thumbnail_cache[self.media.pk] = ctk_image
+                    MediaCard._cache_thumbnail(pk, image)
                     
-                    # Update UI in main thread
-                    self.after(0, lambda: self._update_thumbnail(ctk_image))
+                    # Update UI in main thread (batched with other completions)
+                    MediaCard._enqueue_update(self, ctk_image, generation)
                     
                 except Exception as e:
                     # Log error and update UI in main thread
+                    error = e
                     error_msg = str(e)
-                    self.after(0, lambda: self._handle_thumbnail_error(error_msg))
+                    self.after(0, lambda: self._handle_thumbnail_error(error_msg, generation))
                 finally:
-                    # Decrement active loads counter
-                    with MediaCard._active_loads_lock:
-                        MediaCard._active_loads -= 1
+                    # Release any cards waiting on this load
+                    with MediaCard._cache_lock:
+                        MediaCard._inflight.pop(pk, None)
+                    if error is not None:
+                        leader_future.set_exception(error)
+                    elif image is None:
+                        # Cancelled; any waiting cards start their own load
+                        leader_future.cancel()
+                    else:
+                        leader_future.set_result(image)
             
-            # Submit task to executor
-            self.thumbnail_future = MediaCard._thumbnail_executor.submit(load_thumbnail_task)
+            # Queue task for the worker pool
+            MediaCard._start_thumbnail_workers()
+            MediaCard._thumbnail_queue.put((self.item.index, next(MediaCard._thumbnail_seq), load_thumbnail_task))
             
         except Exception as e:
             self._handle_thumbnail_error(str(e))
     
-    def _update_thumbnail(self, ctk_image):
-        """Update thumbnail in UI thread."""
+    def _on_shared_thumbnail(self, future, generation):
+        """Apply the result of another card's load of the same media in UI thread."""
+        if self._cancelled or generation != self._load_generation:
+            return
+        if future.cancelled():
+            # The loading card was destroyed or recycled before finishing
+            self.load_thumbnail()
+            return
+        error = future.exception()
+        if error is not None:
+            self._handle_thumbnail_error(str(error), generation)
+            return
+        image = future.result() or MediaCard._get_cached_thumbnail(self.media.pk)
+        if image is None:
+            self._handle_thumbnail_error("Thumbnail not available")
+            return
+        self._update_thumbnail(ctk.CTkImage(light_image=image, dark_image=image, size=(THUMBNAIL_SIZE, THUMBNAIL_SIZE)), generation)
+    
+    def _update_thumbnail(self, ctk_image, generation=None):
+        """Update thumbnail in UI thread, ignoring results for a media no longer shown."""
         try:
+            if generation is not None and generation != self._load_generation:
+                return
             if not self.winfo_exists():
                 return
             self.thumbnail_image = ctk_image
@@ -414,9 +750,11 @@ class MediaCard(ctk.CTkFrame):
         except Exception as e:
             self.log_to_terminal(f"Error updating thumbnail: {str(e)}")
     
-    def _handle_thumbnail_error(self, error_msg):
+    def _handle_thumbnail_error(self, error_msg, generation=None):
         """Handle thumbnail loading error in UI thread."""
         try:
+            if generation is not None and generation != self._load_generation:
+                return
             if not self.winfo_exists():
                 return
             self.log_to_terminal(f"Failed to load thumbnail: {error_msg}")
@@ -442,14 +780,15 @@ class MediaCard(ctk.CTkFrame):
     def check_repost_status(self):
         """Check if this media has been reposted to any alt accounts."""
         try:
-            if not self.reposter:
+            if not self.reposter or self.item is None:
                 return
                 
-            # Get repost status
-            self.reposted_to = self.reposter.check_repost_status(self.media)
+            # Get repost status and store it on the item (refreshes this card if still bound)
+            item = self.item
+            reposted_to = self.reposter.check_repost_status(item.media)
             
             # Update UI in main thread
-            self.after(0, self.update_repost_status)
+            self.after(0, item.update_repost_status, reposted_to)
         except Exception as e:
             self.log_to_terminal(f"Error checking repost status: {str(e)}")
             
@@ -458,57 +797,41 @@ class MediaCard(ctk.CTkFrame):
         
         Args:
             reposted_to: Optional list of usernames where this media was reposted.
-                         If provided, updates self.reposted_to.
+                         If provided, updates the bound item's reposted_to.
         """
         try:
+            # Update reposted_to if provided
+            if reposted_to is not None and self.item is not None:
+                self.item.reposted_to = reposted_to
+                self.item.repost_status_known = True
+            
             if not self.winfo_exists():
                 return
-            
-            # Update reposted_to if provided
-            if reposted_to is not None:
-                self.reposted_to = reposted_to
-                
-            # Clear existing repost status
-            for widget in self.repost_container.winfo_children():
-                widget.destroy()
                 
-            # Create repost status label
+            # Reconfigure the existing labels in place
             if not self.reposted_to:
-                status_label = ctk.CTkLabel(
-                    self.repost_container,
+                self._status_label.configure(
                     text="Not reposted",
-                    font=ctk.CTkFont(family="Helvetica", size=10),  # Reduced from 11
+                    font=self._status_font,
                     text_color=COLORS["text_secondary"]
                 )
-                status_label.pack(side="left", padx=8, pady=2)
+                self._reposter_label.pack_forget()
             else:
-                # Create a label showing repost count for consistency
+                # Show repost count for consistency
                 status_text = f"Reposted to {len(self.reposted_to)} account(s)"
-                status_label = ctk.CTkLabel(
-                    self.repost_container,
+                self._status_label.configure(
                     text=status_text,
-                    font=ctk.CTkFont(family="Helvetica", size=10, weight="bold"),
+                    font=self._status_font_bold,
                     text_color=COLORS["success"]
                 )
-                status_label.pack(side="left", padx=8, pady=2)
                 
                 # Only show first username if there are multiple to maintain consistent layout
-                if len(self.reposted_to) > 0:
-                    username = self.reposted_to[0]
-                    if len(self.reposted_to) > 1:
-                        username += " + others"
-                        
-                    reposter_label = ctk.CTkLabel(
-                        self.repost_container,
-                        text=username,
-                        font=ctk.CTkFont(family="Helvetica", size=10),
-                        text_color=COLORS["success"],
-                        fg_color=COLORS["bg_dark"],
-                        corner_radius=6,
-                        width=100,
-                        height=20
-                    )
-                    reposter_label.pack(side="right", padx=5, pady=2)
+                username = self.reposted_to[0]
+                if len(self.reposted_to) > 1:
+                    username += " + others"
+                self._reposter_label.configure(text=username)
+                if not self._reposter_label.winfo_manager():
+                    self._reposter_label.pack(side="right", padx=5, pady=2)
                 
         except Exception as e:
             self.log_to_terminal(f"Error updating repost status: {str(e)}")
@@ -17,6 +17,12 @@ class ProgressDialog(ctk.CTkToplevel):
         self.attributes('-topmost', True)
         
         self.progress_var = ctk.DoubleVar()
+        
+        # Latest requested progress, applied once per idle cycle
+        self._pending_value = None
+        self._pending_status = None
+        self._scheduled = False
+        
         self.setup_ui()
         
         # Bind close button to cancel
@@ -69,11 +75,34 @@ class ProgressDialog(ctk.CTkToplevel):
         self.progressbar.set(0)
         
     def update_progress(self, value, status=None):
+        """Record the latest progress; rapid calls are coalesced into one redraw."""
+        self._pending_value = value
+        if status:
+            self._pending_status = status
+        
+        if self._scheduled:
+            return
+            
+        try:
+            if not self.winfo_exists():
+                return
+            self._scheduled = True
+            self.after_idle(self._flush_progress)
+        except Exception:
+            self._scheduled = False  # Handle case where dialog is being destroyed
+            
+    def _flush_progress(self):
+        """Apply the most recent progress value and status."""
+        self._scheduled = False
+        value, status = self._pending_value, self._pending_status
+        self._pending_status = None
+        
         if not self.winfo_exists():
             return
             
         try:
-            self.progressbar.set(value)
+            if value is not None:
+                self.progressbar.set(value)
             if status:
                 self.status_label.configure(text=status)
         except Exception:
@@ -5,8 +5,36 @@ This implementation uses pagination instead of scrolling.
 import customtkinter as ctk
 import logging
 import math
+import bisect
+from operator import attrgetter
 from utils.constants import COLORS
-from components.media_card import MediaCard
+from components.media_card import MediaCard, MediaItem
+
+# Theme colors resolved once at import
+_ACCENT = COLORS.get("accent", "#1f538d")
+_ACCENT_DARK = COLORS.get("accent_dark", "#0d2e4d")
+_BG_MEDIUM = COLORS.get("bg_medium", "#3e4042")
+_BG_LIGHT = COLORS.get("bg_light", "#333333")
+
+# media_type filter value -> Instagram media_type code
+_MEDIA_TYPE_CODES = {"photo": 1, "video": 2}
+
+# sort_by value -> getter for the matching column of ScrollableMediaFrame
+_SORT_COLUMNS = {
+    "date": attrgetter("_taken_at"),
+    "likes": attrgetter("_like_counts"),
+    "comments": attrgetter("_comment_counts"),
+}
+
+class _Descending:
+    """Sort key wrapper that inverts ordering, for bisecting descending lists."""
+    __slots__ = ("value",)
+    
+    def __init__(self, value):
+        self.value = value
+        
+    def __lt__(self, other):
+        return other.value < self.value
 
 class ScrollableMediaFrame(ctk.CTkFrame):
     """
@@ -31,11 +59,32 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         self.parent = parent
         self.reposter = reposter
         
-        # Media storage
-        self.media_cards = []
-        self.filtered_cards = []
-        self.selected_cards = []  # Track multiple selected cards
-        self.visible_cards = []  # Currently visible cards (for current page)
+        # Media storage - one MediaItem per media; cards are only a view onto them
+        self.media_items = []
+        self.filtered_items = []
+        self.selected_items = []  # Track multiple selected items, in selection order
+        self._selected_set = set()  # Same items, for O(1) membership checks
+        self.visible_cards = []  # Card slots showing the current page
+        
+        # Recycled MediaCard widgets, grown on demand up to one page worth
+        self._card_slots = []
+        
+        # Last (search_text, media_type, sort_by, sort_order) passed to filter_and_sort_media,
+        # with search_text lowercased and media_type resolved to its numeric code (or None)
+        self._active_filter = None
+        
+        # (page, items_per_page, columns, list id, list length) of the last rendered page
+        self._last_render_sig = None
+        
+        # While > 0, add_media only appends and repagination is deferred
+        self._bulk_depth = 0
+        
+        # Column store of the fields used by filter_and_sort_media, parallel to media_items
+        self._media_types = []
+        self._taken_at = []
+        self._like_counts = []
+        self._comment_counts = []
+        self._captions_lower = []
         
         # Define standard card dimensions - SMALLER SIZES
         self.CARD_WIDTH = 160     # Reduced from 200
@@ -54,6 +103,8 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         # Create the content frame
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.content_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        # The grid sizes the content frame; regridding cards must not resize it
+        self.content_frame.grid_propagate(False)
         
         # Create pagination controls frame
         self.controls_frame = ctk.CTkFrame(self, fg_color="transparent", height=30)
@@ -71,8 +122,8 @@ class ScrollableMediaFrame(ctk.CTkFrame):
             self.controls_frame, 
             text="◀ Prev", 
             command=self._go_to_prev_page,
-            fg_color=COLORS.get("accent", "#1f538d"),
-            hover_color=COLORS.get("accent_dark", "#0d2e4d"),
+            fg_color=_ACCENT,
+            hover_color=_ACCENT_DARK,
             width=80,         # Reduced from 100
             height=24         # Reduced from default
         )
@@ -82,7 +133,7 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         self.page_indicator = ctk.CTkLabel(
             self.controls_frame, 
             text="Page 0 of 0",
-            fg_color=COLORS.get("bg_medium", "#3e4042"),
+            fg_color=_BG_MEDIUM,
             corner_radius=5,
             width=80,         # Reduced from 100
             height=24         # Reduced from 30
@@ -94,8 +145,8 @@ class ScrollableMediaFrame(ctk.CTkFrame):
             self.controls_frame, 
             text="Next ▶", 
             command=self._go_to_next_page,
-            fg_color=COLORS.get("accent", "#1f538d"),
-            hover_color=COLORS.get("accent_dark", "#0d2e4d"),
+            fg_color=_ACCENT,
+            hover_color=_ACCENT_DARK,
             width=80,         # Reduced from 100
             height=24         # Reduced from default
         )
@@ -106,11 +157,17 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         self.current_columns = 3
         self.current_rows = 3
         
-        for i in range(self.current_columns):
-            self.content_frame.grid_columnconfigure(i, weight=1)
-            
-        for i in range(self.current_rows):
-            self.content_frame.grid_rowconfigure(i, weight=1)
+        # Number of leading content grid columns/rows currently given weight 1
+        self._configured_cols = 0
+        self._configured_rows = 0
+        self._configure_content_grid(self.current_columns, self.current_rows)
+        
+        # Pending debounced layout update and the last size it was scheduled for
+        self._resize_after_id = None
+        self._last_resize_size = None
+        
+        # Frame size the current layout was computed for
+        self._layout_cache_key = None
         
         # Initial layout update on window resize
         self.bind("<Configure>", self._handle_resize)
@@ -121,22 +178,41 @@ class ScrollableMediaFrame(ctk.CTkFrame):
     def _handle_resize(self, event=None):
         """Handle resize events by updating the layout."""
         # Ignore small frames
-        if self.winfo_width() < 100 or self.winfo_height() < 100:
+        width, height = self.winfo_width(), self.winfo_height()
+        if width < 100 or height < 100:
             return
+        
+        # Configure also fires for moves and child changes; only react to real size changes
+        if (width, height) == self._last_resize_size:
+            return
+        self._last_resize_size = (width, height)
             
-        # Schedule a layout update
-        self.after(100, self._update_layout)
+        # Debounce: restart the timer so layout runs once after resizing settles
+        if self._resize_after_id is not None:
+            self.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.after(150, self._run_debounced_layout)
+        
+    def _run_debounced_layout(self):
+        """Run the layout update scheduled by _handle_resize."""
+        self._resize_after_id = None
+        self._update_layout()
         
     def _update_layout(self):
         """Update the layout of media cards based on available width."""
+        # Nothing to recompute if the frame size is unchanged since the last layout
+        key = (self.winfo_width(), self.winfo_height())
+        if key == self._layout_cache_key:
+            return
+        self._layout_cache_key = key
+        
         # Calculate how many columns fit based on available width
-        available_width = self.winfo_width() - 20
+        available_width = key[0] - 20
         card_width_with_spacing = self.CARD_WIDTH + (2 * self.CARD_SPACING)
         
         columns = max(1, min(5, available_width // card_width_with_spacing))  # Allow up to 5 columns (increased from 4)
         
         # Calculate how many rows fit based on available height
-        available_height = self.winfo_height() - 80  # Account for pagination controls
+        available_height = key[1] - 80  # Account for pagination controls
         card_height_with_spacing = self.CARD_HEIGHT + (2 * self.CARD_SPACING)
         
         rows = max(1, min(4, available_height // card_height_with_spacing))  # Allow up to 4 rows (increased from 3)
@@ -148,24 +224,49 @@ class ScrollableMediaFrame(ctk.CTkFrame):
             self.items_per_page = columns * rows
             
             # Configure content grid
-            for i in range(columns):
-                self.content_frame.grid_columnconfigure(i, weight=1)
-                
-            for i in range(rows):
-                self.content_frame.grid_rowconfigure(i, weight=1)
+            self._configure_content_grid(columns, rows)
                 
             logging.debug(f"Layout updated: {columns}x{rows} grid with {self.items_per_page} items per page")
             
             # Re-paginate with new page size
             self._update_pagination()
     
+    def _configure_content_grid(self, columns, rows):
+        """Weight the first columns x rows cells, touching only indices that changed."""
+        old_cols, old_rows = self._configured_cols, self._configured_rows
+        
+        # Growing gives the new indices weight 1, shrinking resets the dropped ones to 0
+        for i in range(min(old_cols, columns), max(old_cols, columns)):
+            self.content_frame.grid_columnconfigure(i, weight=1 if i < columns else 0)
+        for i in range(min(old_rows, rows), max(old_rows, rows)):
+            self.content_frame.grid_rowconfigure(i, weight=1 if i < rows else 0)
+        
+        self._configured_cols = columns
+        self._configured_rows = rows
+    
     def _update_pagination(self):
         """Update pagination based on current items and page size."""
-        cards = self.filtered_cards if self.filtered_cards else self.media_cards
+        # Deferred until the current bulk load finishes
+        if self._bulk_depth:
+            return
+        
+        items = self.filtered_items if self.filtered_items else self.media_items
+        
+        # Nothing to page through: reset the controls and skip the page rebuild
+        if not items:
+            self.total_pages = 0
+            self.current_page = 0
+            self.page_indicator.configure(text="Page 0 of 0")
+            self.prev_button.configure(state="disabled")
+            self.next_button.configure(state="disabled")
+            self._release_slots(self.visible_cards)
+            self.visible_cards = []
+            self._last_render_sig = None
+            return
         
         # Calculate total pages
         if self.items_per_page > 0:
-            self.total_pages = math.ceil(len(cards) / self.items_per_page)
+            self.total_pages = math.ceil(len(items) / self.items_per_page)
         else:
             self.total_pages = 0
             
@@ -183,41 +284,59 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         # Show current page
         self._show_current_page()
     
+    def _get_card_slot(self, index):
+        """Return the recycled card widget for a page position, creating it if needed."""
+        while len(self._card_slots) <= index:
+            self._card_slots.append(MediaCard(
+                self.content_frame,
+                None,
+                self.reposter,
+                width=self.CARD_WIDTH,
+                height=self.CARD_HEIGHT,
+                fg_color=_BG_LIGHT,
+                corner_radius=8
+            ))
+        return self._card_slots[index]
+    
+    def _release_slots(self, cards):
+        """Hide card slots and detach their media in one pass."""
+        for card in cards:
+            card.grid_remove()
+            card.bind_media(None)
+    
     def _show_current_page(self):
-        """Display the current page of media cards."""
-        cards = self.filtered_cards if self.filtered_cards else self.media_cards
+        """Display the current page of media items in the recycled card slots."""
+        items = self.filtered_items if self.filtered_items else self.media_items
         
-        # Hide all cards first
-        for card in self.visible_cards:
-            card.grid_forget()
-        
-        self.visible_cards = []
-        
-        # If no cards or invalid page, just return
-        if not cards or self.current_page < 0 or self.total_pages == 0:
+        # Nothing to do if the same slice is already laid out the same way
+        sig = (self.current_page, self.items_per_page, self.current_columns, id(items), len(items))
+        if sig == self._last_render_sig:
             return
+        self._last_render_sig = sig
         
         # Calculate start and end indices for current page
         start_idx = self.current_page * self.items_per_page
-        end_idx = min(start_idx + self.items_per_page, len(cards))
+        end_idx = min(start_idx + self.items_per_page, len(items))
+        if not items or self.current_page < 0 or self.total_pages == 0:
+            end_idx = start_idx
+        page_size = end_idx - start_idx
+        
+        # Hide and unbind slots not needed for this page
+        self._release_slots(self.visible_cards[page_size:])
         
-        # Show cards for current page
+        self.visible_cards = []
+        
+        # Show items for current page
         for i, idx in enumerate(range(start_idx, end_idx)):
-            if idx >= len(cards):
-                break
-                
-            card = cards[idx]
+            card = self._get_card_slot(i)
+            
+            # Rebind the slot in place instead of creating a new widget
+            card.bind_media(items[idx])
             
-            # Calculate grid position
+            # Calculate grid position (slots are created at the standard card size)
             row = i // self.current_columns
             col = i % self.current_columns
             
-            # Standard card size
-            try:
-                card.configure(width=self.CARD_WIDTH, height=self.CARD_HEIGHT)
-            except Exception:
-                pass
-                
             # Place card in grid
             card.grid(
                 in_=self.content_frame,
@@ -230,6 +349,9 @@ class ScrollableMediaFrame(ctk.CTkFrame):
             
             # Add to visible cards
             self.visible_cards.append(card)
+        
+        # Flush geometry once for the whole page rather than per card
+        self.content_frame.update_idletasks()
     
     def _go_to_next_page(self):
         """Go to the next page."""
@@ -255,57 +377,98 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         self._go_to_next_page()
         return "break"
             
-    def add_media(self, media):
-        """Add a new media item to the grid."""
-        # Create media card with selection callback
-        card = MediaCard(
-            self.content_frame,
+    def add_media(self, media, reposted_to=None):
+        """Add a new media item to the grid.
+        
+        Args:
+            media: The media item to display
+            reposted_to: Optional precomputed repost status (list of usernames)
+        """
+        # Only a lightweight record is created; widgets are recycled per page
+        item = MediaItem(
             media,
-            self.reposter,
-            on_select=self.handle_selection,
-            width=self.CARD_WIDTH,
-            height=self.CARD_HEIGHT,
-            fg_color=COLORS.get("bg_light", "#333333"),
-            corner_radius=8
+            reposted_to=reposted_to,
+            index=len(self.media_items),
+            on_select=self.handle_selection
         )
         
-        # Add to list of all cards
-        self.media_cards.append(card)
+        # Add to list of all items
+        self.media_items.append(item)
+        self._media_types.append(getattr(media, "media_type", 0))
+        self._taken_at.append(getattr(media, "taken_at", 0) or 0)
+        self._like_counts.append(getattr(media, "like_count", 0) or 0)
+        self._comment_counts.append(getattr(media, "comment_count", 0) or 0)
+        self._captions_lower.append((getattr(media, "caption_text", "") or "").lower())
+        
+        # Keep an active filter up to date without rescanning everything
+        if self._active_filter is not None and self._matches(item.index):
+            self._insert_filtered(item)
+        self._last_render_sig = None
         
-        # Update pagination for the new card
+        # Update pagination for the new item
         self._update_pagination()
         
-        return card
+        return item
         
-    def handle_selection(self, selected_card):
-        """Handle selection of a media card."""
+    def add_media_batch(self, medias, repost_status=None):
+        """Add many media items, repaginating once at the end.
+        
+        Args:
+            medias: The media items to display
+            repost_status: Optional dict mapping media pk to a precomputed repost status
+        """
+        items = []
+        self._bulk_depth += 1
+        try:
+            for media in medias:
+                reposted_to = repost_status.get(media.pk) if repost_status else None
+                items.append(self.add_media(media, reposted_to=reposted_to))
+        finally:
+            self._bulk_depth -= 1
+        
+        self._update_pagination()
+        return items
+        
+    def handle_selection(self, selected_item):
+        """Handle selection of a media item."""
         # Support multi-selection
-        if selected_card.selected:
-            # Card was selected, add to selection list
-            self.selected_cards.append(selected_card)
+        if selected_item.selected:
+            # Item was selected, add to selection list
+            if selected_item not in self._selected_set:
+                self._selected_set.add(selected_item)
+                self.selected_items.append(selected_item)
             # Update the selection badge with the selection number
-            selected_card.selection_badge.configure(text=str(len(self.selected_cards)))
-        else:
-            # Card was deselected, remove from selection list
-            if selected_card in self.selected_cards:
-                self.selected_cards.remove(selected_card)
+            selected_item.set_selection_number(len(self.selected_items))
+        elif selected_item in self._selected_set:
+            # Item was deselected, remove from selection list
+            self._selected_set.discard(selected_item)
+            index = self.selected_items.index(selected_item)
+            del self.selected_items[index]
                 
-            # Update remaining selection badges with new numbers
-            for i, card in enumerate(self.selected_cards):
-                card.selection_badge.configure(text=str(i+1))
+            # Only badges after the removed one change number
+            for number, item in enumerate(self.selected_items[index:], start=index + 1):
+                item.set_selection_number(number)
                 
         # Update UI elements based on selection state
-        self.parent.update_selection_count(len(self.selected_cards))
+        self.parent.update_selection_count(len(self.selected_items))
                 
     def clear(self):
-        """Clear all media cards."""
-        for card in self.media_cards:
-            card.destroy()
+        """Clear all media items."""
+        # Unbind the recycled slots; the widgets themselves are kept for reuse
+        self._release_slots(self.visible_cards)
             
-        self.media_cards = []
-        self.filtered_cards = []
+        self.media_items = []
+        self.filtered_items = []
         self.visible_cards = []
-        self.selected_cards = []
+        self.selected_items = []
+        self._selected_set = set()
+        self._media_types = []
+        self._taken_at = []
+        self._like_counts = []
+        self._comment_counts = []
+        self._captions_lower = []
+        self._active_filter = None
+        self._last_render_sig = None
         
         # Reset pagination
         self.current_page = 0
@@ -313,12 +476,13 @@ class ScrollableMediaFrame(ctk.CTkFrame):
     
     def clear_selection(self):
         """Clear the current selection."""
-        # Deselect all cards
-        for card in self.selected_cards[:]:
-            card.toggle_select(False)
+        # Deselect all items
+        for item in self.selected_items[:]:
+            item.toggle_select(False)
         
         # Clear the selection list
-        self.selected_cards = []
+        self.selected_items = []
+        self._selected_set = set()
         
         # Update UI elements
         self.parent.update_selection_count(0)
@@ -327,68 +491,74 @@ class ScrollableMediaFrame(ctk.CTkFrame):
         """Select all video items."""
         self.clear_selection()
         
-        for card in self.filtered_cards or self.media_cards:
-            if hasattr(card.media, 'media_type') and card.media.media_type == 2:  # Videos
-                card.toggle_select(True)
+        for item in self.filtered_items or self.media_items:
+            if hasattr(item.media, 'media_type') and item.media.media_type == 2:  # Videos
+                item.toggle_select(True)
         
     def select_all_photos(self):
         """Select all photo items."""
         self.clear_selection()
         
-        for card in self.filtered_cards or self.media_cards:
-            if hasattr(card.media, 'media_type') and card.media.media_type == 1:  # Photos
-                card.toggle_select(True)
+        for item in self.filtered_items or self.media_items:
+            if hasattr(item.media, 'media_type') and item.media.media_type == 1:  # Photos
+                item.toggle_select(True)
                 
     def select_all(self):
         """Select all items."""
         self.clear_selection()
         
-        for card in self.filtered_cards or self.media_cards:
-            card.toggle_select(True)
+        for item in self.filtered_items or self.media_items:
+            item.toggle_select(True)
             
     def get_selected_media(self):
         """Get all currently selected media."""
-        return [card for card in self.media_cards if hasattr(card, "selected") and card.selected]
+        return list(self.selected_items)
+    
+    def _matches(self, index):
+        """Check the media at index against the active filter."""
+        search_text, type_code = self._active_filter[0], self._active_filter[1]
+        return ((type_code is None or self._media_types[index] == type_code)
+                and (not search_text or search_text in self._captions_lower[index]))
+    
+    def _sort_column(self):
+        """Return the column the active filter sorts by, or None if unsorted."""
+        getter = _SORT_COLUMNS.get(self._active_filter[2])
+        return getter(self) if getter is not None else None
+    
+    def _insert_filtered(self, item):
+        """Insert a newly added item into filtered_items at its sorted position."""
+        column = self._sort_column()
+        if column is None:
+            self.filtered_items.append(item)
+        elif self._active_filter[3].lower() == "desc":
+            bisect.insort_right(self.filtered_items, item, key=lambda it: _Descending(column[it.index]))
+        else:
+            bisect.insort_right(self.filtered_items, item, key=lambda it: column[it.index])
     
     def filter_and_sort_media(self, search_text, media_type=None, sort_by=None, sort_order="desc"):
         """Filter and sort media based on criteria."""
-        # Reset filtered cards
-        self.filtered_cards = []
-        
-        # Apply filters
-        for card in self.media_cards:
-            # Text search
-            text_match = True
-            if search_text:
-                search_lower = search_text.lower()
-                card_text = getattr(card.media, "caption_text", "") or ""
-                card_text = card_text.lower()
-                text_match = search_lower in card_text
-            
-            # Media type filter
-            type_match = True
-            if media_type == "video":
-                type_match = getattr(card.media, "media_type", 0) == 2
-            elif media_type == "photo":
-                type_match = getattr(card.media, "media_type", 0) == 1
-            
-            # If all filters match, include card
-            if text_match and type_match:
-                self.filtered_cards.append(card)
+        search_lower = (search_text or "").lower()
+        type_code = _MEDIA_TYPE_CODES.get(media_type)
+        self._active_filter = (search_lower, type_code, sort_by, sort_order)
+        
+        # Work on indices into the column store, then materialize the items once
+        types, captions = self._media_types, self._captions_lower
+        indices = [
+            i for i in range(len(self.media_items))
+            if (type_code is None or types[i] == type_code)
+            and (not search_lower or search_lower in captions[i])
+        ]
         
         # Apply sorting
-        if sort_by:
-            reverse = sort_order.lower() == "desc"
-            
-            if sort_by == "date":
-                self.filtered_cards.sort(key=lambda c: getattr(c.media, "taken_at", 0) or 0, reverse=reverse)
-            elif sort_by == "likes":
-                self.filtered_cards.sort(key=lambda c: getattr(c.media, "like_count", 0) or 0, reverse=reverse)
-            elif sort_by == "comments":
-                self.filtered_cards.sort(key=lambda c: getattr(c.media, "comment_count", 0) or 0, reverse=reverse)
+        column = self._sort_column()
+        if column is not None:
+            indices.sort(key=column.__getitem__, reverse=sort_order.lower() == "desc")
+        
+        self.filtered_items = [self.media_items[i] for i in indices]
+        self._last_render_sig = None
         
         # Reset to first page and update pagination
         self.current_page = 0
         self._update_pagination()
         
-        return len(self.filtered_cards) 
\ No newline at end of file
+        return len(self.filtered_items) 
\ No newline at end of file
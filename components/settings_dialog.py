@@ -2,7 +2,9 @@
 Settings dialog component for the Instagram Repost tool.
 """
 import customtkinter as ctk
+import copy
 import json
+import os
 import tkinter.messagebox as tkmb
 from utils.constants import HAS_CTK_MESSAGEBOX
 
@@ -10,6 +12,11 @@ from utils.constants import HAS_CTK_MESSAGEBOX
 if HAS_CTK_MESSAGEBOX:
     from CTkMessagebox import CTkMessagebox
 
+SETTINGS_FILE = "settings.json"
+
+# Last settings read from or written to SETTINGS_FILE, keyed by its mtime
+_SETTINGS_CACHE = {"mtime": None, "data": None}
+
 class SettingsDialog(ctk.CTkToplevel):
     def __init__(self, parent):
         super().__init__(parent)
@@ -61,19 +68,34 @@ class SettingsDialog(ctk.CTkToplevel):
         
     def load_settings(self):
         try:
-            with open("settings.json", "r") as f:
-                return json.load(f)
+            mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+            if mtime != _SETTINGS_CACHE["mtime"]:
+                with open(SETTINGS_FILE, "r") as f:
+                    _SETTINGS_CACHE["data"] = json.load(f)
+                _SETTINGS_CACHE["mtime"] = mtime
+            return copy.copy(_SETTINGS_CACHE["data"])
         except:
             return {"auto_repost_interval": 5, "theme": "dark"}
             
     def save_settings(self):
         try:
-            self.settings["auto_repost_interval"] = int(self.interval_var.get())
-            with open("settings.json", "w") as f:
-                json.dump(self.settings, f)
-            self.destroy()
+            settings = dict(self.settings, auto_repost_interval=int(self.interval_var.get()))
         except ValueError:
             self.show_error("Invalid interval value")
+            return
+        
+        # Nothing to write if the file already holds these settings
+        if settings != _SETTINGS_CACHE["data"]:
+            # Write to a temporary file first so a crash can't leave a truncated file
+            tmp_path = SETTINGS_FILE + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(settings, f)
+            os.replace(tmp_path, SETTINGS_FILE)
+            _SETTINGS_CACHE["data"] = settings
+            _SETTINGS_CACHE["mtime"] = os.stat(SETTINGS_FILE).st_mtime_ns
+        
+        self.settings = settings
+        self.destroy()
             
     def show_error(self, message):
         if HAS_CTK_MESSAGEBOX:
@@ -2,23 +2,48 @@
 Text handling components for logging and terminal output.
 """
 import logging
+import threading
 import tkinter as tk
+from collections import deque
+
+# Delay before buffered output is flushed to the widget (about one frame)
+FLUSH_DELAY_MS = 16
+# Oldest lines are dropped once the terminal holds more than this
+MAX_TERMINAL_LINES = 5000
+
+def _trim_lines(text_widget, max_lines=MAX_TERMINAL_LINES):
+    """Delete the oldest lines so the widget holds at most max_lines."""
+    lines = int(text_widget.index("end-1c").split(".")[0])
+    if lines > max_lines:
+        text_widget.delete("1.0", f"{lines - max_lines + 1}.0")
 
 class TextRedirector:
     def __init__(self, text_widget):
         self.text_widget = text_widget
         self.buffer = ""
+        # Writes may come from worker threads; one flush is scheduled per burst
+        self._lock = threading.Lock()
+        self._pending = False
         
     def write(self, string):
-        self.buffer += string
-        self.text_widget.after(0, self.update_text_widget)
+        with self._lock:
+            self.buffer += string
+            if self._pending:
+                return
+            self._pending = True
+        self.text_widget.after(FLUSH_DELAY_MS, self.update_text_widget)
         
     def update_text_widget(self):
+        with self._lock:
+            text, self.buffer = self.buffer, ""
+            self._pending = False
+        if not text:
+            return
         self.text_widget.configure(state="normal")
-        self.text_widget.insert("end", self.buffer)
+        self.text_widget.insert("end", text)
+        _trim_lines(self.text_widget)
         self.text_widget.see("end")
         self.text_widget.configure(state="disabled")
-        self.buffer = ""
         
     def flush(self):
         pass
@@ -28,22 +53,48 @@ class TextWidgetHandler(logging.Handler):
     def __init__(self, text_widget):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
+        # Formatted records waiting for the next flush
+        self._records = deque()
+        self._records_lock = threading.Lock()
+        self._pending = False
         
     def emit(self, record):
         msg = self.format(record)
-        self.text_widget.after(0, self.update_text_widget, msg + "\n", record.levelno)
+        with self._records_lock:
+            self._records.append((msg + "\n", record.levelno))
+            if self._pending:
+                return
+            self._pending = True
+        self.text_widget.after(FLUSH_DELAY_MS, self._flush_records)
+        
+    def _flush_records(self):
+        """Write all buffered records in a single widget update."""
+        with self._records_lock:
+            records, self._records = self._records, deque()
+            self._pending = False
+        if not records:
+            return
+        
+        # Group consecutive records with the same tag into one insert
+        groups = []
+        for msg, level in records:
+            tag = self._tag_for_level(level)
+            if groups and groups[-1][0] == tag:
+                groups[-1][1].append(msg)
+            else:
+                groups.append((tag, [msg]))
         
-    def update_text_widget(self, msg, level):
         self.text_widget.configure(state="normal")
+        for tag, msgs in groups:
+            self.text_widget.insert("end", "".join(msgs), tag)
+        _trim_lines(self.text_widget)
+        self.text_widget.see("end")
+        self.text_widget.configure(state="disabled")
         
+    def _tag_for_level(self, level):
         # Choose tag based on log level
-        tag = "info"
         if level >= logging.ERROR:
-            tag = "error"
+            return "error"
         elif level >= logging.WARNING:
-            tag = "warning"
-            
-        # Insert the text with the appropriate tag
-        self.text_widget.insert("end", msg, tag)
-        self.text_widget.see("end")
-        self.text_widget.configure(state="disabled") 
\ No newline at end of file
+            return "warning"
+        return "info"
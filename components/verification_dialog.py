@@ -2,11 +2,20 @@
 Verification dialog component for handling Instagram verification codes.
 """
 import customtkinter as ctk
+import tkinter as tk
 import tkinter.messagebox as tkmb
 from utils.constants import COLORS, HAS_CTK_MESSAGEBOX
-import time
 import logging
 
+# Theme colors resolved once at import
+_BG_DARK = COLORS["bg_dark"]
+_BG_MEDIUM = COLORS["bg_medium"]
+_BG_LIGHT = COLORS["bg_light"]
+_ACCENT = COLORS["accent"]
+_ACCENT_HOVER = COLORS["accent_hover"]
+_TEXT_PRIMARY = COLORS["text_primary"]
+_TEXT_SECONDARY = COLORS["text_secondary"]
+
 # Import CTkMessagebox if available
 if HAS_CTK_MESSAGEBOX:
     from CTkMessagebox import CTkMessagebox
@@ -28,7 +37,7 @@ class VerificationDialog(ctk.CTkToplevel):
             self.title(f"Verification Required")
         
         self.geometry("400x240")
-        self.configure(fg_color=COLORS["bg_medium"])
+        self.configure(fg_color=_BG_MEDIUM)
         
         # Make dialog modal
         self.transient(parent)
@@ -38,6 +47,10 @@ class VerificationDialog(ctk.CTkToplevel):
         # Initialize code
         self.verification_code = None
         
+        # Set when the dialog closes, so callers can wait on it without polling
+        self._done_var = tk.BooleanVar(self, value=False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        
         # Setup UI
         self.setup_ui()
 
@@ -58,7 +71,7 @@ class VerificationDialog(ctk.CTkToplevel):
             container,
             text=title_text,
             font=ctk.CTkFont(family="Helvetica", size=16, weight="bold"),
-            text_color=COLORS["text_primary"]
+            text_color=_TEXT_PRIMARY
         )
         title.pack(pady=(0, 15))
         
@@ -72,7 +85,7 @@ class VerificationDialog(ctk.CTkToplevel):
             container,
             text=message_text,
             font=ctk.CTkFont(family="Helvetica", size=12),
-            text_color=COLORS["text_secondary"],
+            text_color=_TEXT_SECONDARY,
             justify="center"
         )
         message.pack(pady=(0, 20))
@@ -86,7 +99,7 @@ class VerificationDialog(ctk.CTkToplevel):
             code_frame,
             text="Code:",
             font=ctk.CTkFont(family="Helvetica", size=12),
-            text_color=COLORS["text_primary"]
+            text_color=_TEXT_PRIMARY
         )
         code_label.pack(side="left", padx=(0, 10))
         
@@ -109,8 +122,8 @@ class VerificationDialog(ctk.CTkToplevel):
             btn_frame,
             text="Submit",
             command=self.submit_code,
-            fg_color=COLORS["accent"],
-            hover_color=COLORS["accent_hover"],
+            fg_color=_ACCENT,
+            hover_color=_ACCENT_HOVER,
             width=100
         )
         submit_btn.pack(side="right", padx=5)
@@ -121,8 +134,8 @@ class VerificationDialog(ctk.CTkToplevel):
                 btn_frame,
                 text="Cancel",
                 command=self.cancel,
-                fg_color=COLORS["bg_dark"],
-                hover_color=COLORS["bg_light"],
+                fg_color=_BG_DARK,
+                hover_color=_BG_LIGHT,
                 width=100
             )
             cancel_btn.pack(side="right", padx=5)
@@ -146,6 +159,11 @@ class VerificationDialog(ctk.CTkToplevel):
         self.verification_code = None
         self.destroy()
         
+    def destroy(self):
+        # Signal waiters however the dialog goes away, including parent teardown
+        self._done_var.set(True)
+        super().destroy()
+        
     @staticmethod
     def show_dialog(parent, username, challenge_type, title=None, message=None, has_cancel=False):
         """Show a verification dialog and wait for the result.
@@ -169,11 +187,10 @@ class VerificationDialog(ctk.CTkToplevel):
             try:
                 dialog.wait_window()
             except Exception as e:
-                # If wait_window fails, use a polling approach
-                logging.warning(f"wait_window failed, using polling approach: {str(e)}")
-                while dialog.winfo_exists():
-                    parent.update()
-                    time.sleep(0.1)
+                # If wait_window fails, wait for the dialog to signal that it closed
+                logging.warning(f"wait_window failed, waiting on close variable: {str(e)}")
+                if not dialog._done_var.get():
+                    parent.wait_variable(dialog._done_var)
             
             return dialog.verification_code
         except Exception as e:
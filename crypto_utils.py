@@ -1,115 +1,285 @@
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 import base64
+import functools
+import hashlib
 import os
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.exceptions import InvalidSignature, InvalidTag
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import json
 import logging
+from operator import itemgetter
 
-logger = logging.getLogger(__name__)
+# Use orjson's C encoder/decoder for config files when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class _NullLogger:
+    """Stand-in logger whose methods do nothing, for release builds."""
+    def _noop(self, *args, **kwargs):
+        pass
+        
+    debug = info = warning = error = exception = _noop
+
+# Setting REPOSTER_PROD skips the logging machinery entirely
+logger = _NullLogger() if os.environ.get("REPOSTER_PROD") else logging.getLogger(__name__)
+
+# First byte of a decoded token: Fernet (AES-128-CBC + HMAC) or AES-256-GCM
+FERNET_VERSION = 0x80
+AESGCM_VERSION = 0x81
+
+# Extra os.open flags for the key file; O_CLOEXEC is POSIX-only, O_BINARY Windows-only
+_OPEN_FLAGS = getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+# PBKDF2-HMAC-SHA256 rounds for password-derived keys
+PBKDF2_ITERATIONS = 600_000
+
+# Bound once so the per-token paths skip module attribute lookups
+_AESGCM_PREFIX = bytes((AESGCM_VERSION,))
+_b64encode = base64.urlsafe_b64encode
+_b64decode = base64.urlsafe_b64decode
+_urandom = os.urandom
+_get_password = itemgetter("password")
+_PKCS7 = padding.PKCS7(algorithms.AES.block_size)
+
+@functools.lru_cache(maxsize=4)
+def _load_key(key_path: str) -> bytes:
+    """Load the key at key_path, creating it if missing. Cached per absolute path."""
+    try:
+        try:
+            return _read_key_file(key_path)
+        except FileNotFoundError:
+            pass
+        
+        # Create the file exclusively (owner-only) so a concurrent creator can't be clobbered
+        key = Fernet.generate_key()
+        try:
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _OPEN_FLAGS, 0o600)
+        except FileExistsError:
+            return _read_key_file(key_path)
+        try:
+            os.write(fd, key)
+        finally:
+            os.close(fd)
+        return key
+    except Exception:
+        logger.exception("Failed to load/create key")
+        raise
+        
+def _read_key_file(key_path: str) -> bytes:
+    """Read the key file with a single open, raising FileNotFoundError if missing."""
+    fd = os.open(key_path, os.O_RDONLY | _OPEN_FLAGS)
+    try:
+        return os.read(fd, 64)
+    finally:
+        os.close(fd)
+        
+@functools.lru_cache(maxsize=4)
+def _expand_key(key: bytes) -> tuple:
+    """Build the (Fernet, HMAC template, AES key, AESGCM) objects for a key once."""
+    # The Fernet halves still decrypt tokens written before the switch to AES-GCM
+    raw_key = base64.urlsafe_b64decode(key)
+    hmac_template = HMAC(raw_key[:16], hashes.SHA256())
+    aes = algorithms.AES(raw_key[16:])
+    
+    # New tokens use AES-256-GCM with a key derived from the same key file
+    aead = AESGCM(HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"reposter password aes-256-gcm",
+    ).derive(raw_key))
+    return Fernet(key), hmac_template, aes, aead
 
 class PasswordManager:
     def __init__(self, key_file="crypto.key"):
         self.key_file = key_file
         self.key = self._load_or_create_key()
-        self.fernet = Fernet(self.key)
+        
+        # Key file reads and key expansion are shared by every instance using the same key
+        self.fernet, self._hmac, self._aes, self.aead = _expand_key(self.key)
+        self._aead_encrypt = self.aead.encrypt
+        self._aead_decrypt = self.aead.decrypt
         
     def _load_or_create_key(self) -> bytes:
         """Load existing key or create a new one."""
+        return _load_key(os.path.abspath(self.key_file))
+            
+    def _encrypt_token(self, data: bytes, nonce: bytes = None) -> bytes:
+        """Encrypt data into a version-tagged AES-256-GCM token.
+        
+        Nonces are random rather than derived from the plaintext (AES-GCM-SIV
+        style) so accounts sharing a password don't get identical tokens; batch
+        callers amortize the urandom call instead (see _encrypt_many).
+        """
+        if nonce is None:
+            nonce = _urandom(12)
+        return _b64encode(_AESGCM_PREFIX + nonce + self._aead_encrypt(nonce, data, None))
+        
+    def _decrypt_token(self, token) -> bytes:
+        """Decrypt an AES-GCM token, or a Fernet token from older configs.
+        
+        token may be bytes or an ASCII str, as read from JSON.
+        """
         try:
-            if os.path.exists(self.key_file):
-                with open(self.key_file, "rb") as f:
-                    return f.read()
-            else:
-                key = Fernet.generate_key()
-                with open(self.key_file, "wb") as f:
-                    f.write(key)
-                return key
-        except Exception as e:
-            logger.error(f"Failed to load/create key: {str(e)}")
-            raise
+            data = _b64decode(token)
+        except (TypeError, ValueError):
+            raise InvalidToken
+        if not data:
+            raise InvalidToken
+        
+        if data[0] == AESGCM_VERSION:
+            if len(data) < 29:
+                raise InvalidToken
+            try:
+                return self._aead_decrypt(data[1:13], data[13:], None)
+            except InvalidTag:
+                raise InvalidToken
+        if data[0] == FERNET_VERSION:
+            return self._decrypt_fernet(data)
+        raise InvalidToken
+        
+    def _decrypt_fernet(self, data: bytes) -> bytes:
+        """Verify and decrypt a decoded Fernet token using the pre-expanded keys."""
+        if len(data) < 57:
+            raise InvalidToken
+        
+        h = self._hmac.copy()
+        h.update(data[:-32])
+        try:
+            h.verify(data[-32:])
+        except InvalidSignature:
+            raise InvalidToken
+        
+        decryptor = Cipher(self._aes, modes.CBC(data[9:25])).decryptor()
+        padded = decryptor.update(data[25:-32]) + decryptor.finalize()
+        unpadder = _PKCS7.unpadder()
+        try:
+            return unpadder.update(padded) + unpadder.finalize()
+        except ValueError:
+            raise InvalidToken
             
+    def derive_key(self, password: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+        """Derive a Fernet-format key from a password with PBKDF2-HMAC-SHA256.
+        
+        Results are not cached, so plaintext passwords are never kept around.
+        """
+        # hashlib calls straight into OpenSSL's PBKDF2 implementation
+        raw = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, 32)
+        return base64.urlsafe_b64encode(raw)
+        
+    def encrypt_password_bytes(self, password: bytes) -> bytes:
+        """Encrypt raw bytes into an ASCII token."""
+        return self._encrypt_token(password)
+        
+    def decrypt_password_bytes(self, encrypted_password) -> bytes:
+        """Decrypt a token (bytes or ASCII str) into raw bytes."""
+        return self._decrypt_token(encrypted_password)
+        
     def encrypt_password(self, password: str) -> str:
         """Encrypt a password."""
-        try:
-            return self.fernet.encrypt(password.encode()).decode()
-        except Exception as e:
-            logger.error(f"Failed to encrypt password: {str(e)}")
-            raise
+        return self._encrypt_token(password.encode()).decode("ascii")
             
     def decrypt_password(self, encrypted_password: str) -> str:
-        """Decrypt an encrypted password."""
-        try:
-            if not encrypted_password:
-                raise ValueError("Encrypted password is empty or None")
-                
-            return self.fernet.decrypt(encrypted_password.encode()).decode()
-        except Exception as e:
-            logger.error(f"Failed to decrypt password: {str(e)}")
-            raise ValueError(f"Failed to decrypt password: {str(e)}")
+        """Decrypt an encrypted password.
+        
+        Raises ValueError for an empty token and InvalidToken for a corrupt one;
+        callers that need to log do so around their own batch of calls.
+        """
+        if not encrypted_password:
+            raise ValueError("Encrypted password is empty or None")
+            
+        return self._decrypt_token(encrypted_password).decode()
             
+    def _encrypt_many(self, passwords: list):
+        """Encrypt a batch of passwords, drawing all their nonces from one urandom call."""
+        nonce_pool = _urandom(12 * len(passwords))
+        nonces = [nonce_pool[i:i + 12] for i in range(0, len(nonce_pool), 12)]
+        return list(map(self._encrypt_with_nonce, passwords, nonces))
+        
+    def _encrypt_with_nonce(self, password: str, nonce: bytes) -> str:
+        return self._encrypt_token(password.encode(), nonce).decode("ascii")
+        
+    def _decrypt_many(self, passwords: list):
+        """Decrypt a batch of passwords."""
+        return list(map(self.decrypt_password, passwords))
+        
+    @staticmethod
+    def _map_passwords(accounts: list, transform_many) -> list:
+        """Return accounts with every password passed through transform_many, as new dicts."""
+        # Extract the passwords once so the whole batch is transformed in one call
+        slots = [i for i, account in enumerate(accounts) if account and "password" in account]
+        results = transform_many(list(map(_get_password, [accounts[i] for i in slots])))
+        
+        mapped = list(accounts)
+        for i, password in zip(slots, results):
+            mapped[i] = dict(accounts[i], password=password)
+        return mapped
+        
+    def _transform_config(self, config: dict, transform_many) -> dict:
+        """Apply transform_many to the main and alt account passwords in a single pass.
+        
+        New account dicts are built so the caller's config is left untouched.
+        """
+        main_account = config.get("main_account")
+        has_alts = "alt_accounts" in config
+        
+        # Main account first, then the alts, as one flat list of accounts
+        accounts = [main_account] if main_account else []
+        if has_alts:
+            accounts.extend(config["alt_accounts"])
+        mapped = self._map_passwords(accounts, transform_many)
+        
+        result = dict(config)
+        if main_account:
+            result["main_account"] = mapped[0]
+            mapped = mapped[1:]
+        if has_alts:
+            result["alt_accounts"] = mapped
+        return result
+        
     def encrypt_config(self, config: dict) -> dict:
         """Encrypt passwords in config."""
         try:
-            encrypted_config = config.copy()
-            
-            # Encrypt main account password if it exists
-            if encrypted_config.get("main_account"):
-                if encrypted_config["main_account"] is not None:
-                    encrypted_config["main_account"]["password"] = self.encrypt_password(
-                        encrypted_config["main_account"]["password"]
-                    )
-                
-            # Encrypt alt account passwords
-            if "alt_accounts" in encrypted_config:
-                for account in encrypted_config["alt_accounts"]:
-                    if account and "password" in account:
-                        account["password"] = self.encrypt_password(account["password"])
-                    
-            return encrypted_config
-        except Exception as e:
-            logger.error(f"Failed to encrypt config: {str(e)}")
+            return self._transform_config(config, self._encrypt_many)
+        except Exception:
+            logger.exception("Failed to encrypt config")
             raise
             
     def decrypt_config(self, config: dict) -> dict:
         """Decrypt passwords in config."""
         try:
-            decrypted_config = config.copy()
-            
-            # Decrypt main account password if it exists
-            if decrypted_config.get("main_account"):
-                if decrypted_config["main_account"] is not None:
-                    decrypted_config["main_account"]["password"] = self.decrypt_password(
-                        decrypted_config["main_account"]["password"]
-                    )
-                
-            # Decrypt alt account passwords
-            if "alt_accounts" in decrypted_config:
-                for account in decrypted_config["alt_accounts"]:
-                    if account and "password" in account:
-                        account["password"] = self.decrypt_password(account["password"])
-                    
-            return decrypted_config
-        except Exception as e:
-            logger.error(f"Failed to decrypt config: {str(e)}")
+            return self._transform_config(config, self._decrypt_many)
+        except Exception:
+            logger.exception("Failed to decrypt config")
             raise
             
     def save_encrypted_config(self, config: dict, config_path: str) -> None:
         """Save config with encrypted passwords."""
         try:
             encrypted_config = self.encrypt_config(config)
-            with open(config_path, "w") as f:
-                json.dump(encrypted_config, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save encrypted config: {str(e)}")
+            if orjson is not None:
+                data = orjson.dumps(encrypted_config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(encrypted_config, indent=2).encode()
+            with open(config_path, "wb") as f:
+                f.write(data)
+        except Exception:
+            logger.exception("Failed to save encrypted config")
             raise
             
     def load_decrypted_config(self, config_path: str) -> dict:
         """Load and decrypt config."""
         try:
-            with open(config_path, "r") as f:
-                encrypted_config = json.load(f)
+            with open(config_path, "rb") as f:
+                data = f.read()
+            encrypted_config = orjson.loads(data) if orjson is not None else json.loads(data)
             return self.decrypt_config(encrypted_config)
-        except Exception as e:
-            logger.error(f"Failed to load decrypted config: {str(e)}")
+        except Exception:
+            logger.exception("Failed to load decrypted config")
             raise 
\ No newline at end of file
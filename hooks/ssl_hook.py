@@ -11,14 +11,18 @@ import certifi
 if '.' not in sys.path:
     sys.path.insert(0, '.')
 
+# certifi's own lookup, kept as the fallback before it is overridden below
+_original_where = certifi.where
+
+# sys._MEIPASS is fixed for the life of the process, so the bundled
+# certificate is located once at startup
+_MEIPASS_CERT = os.path.join(sys._MEIPASS, "cacert.pem") if hasattr(sys, '_MEIPASS') else None
+_BUNDLED_EXISTS = _MEIPASS_CERT is not None and os.path.isfile(_MEIPASS_CERT)
+
 # Use the bundled certifi certificate
 def override_where():
     """Override certifi.core.where to return the bundled certificate."""
-    # If bundled certificate exists
-    bundled_cert = os.path.join(sys._MEIPASS, "cacert.pem")
-    if os.path.exists(bundled_cert):
-        return bundled_cert
-    return certifi.where()
+    return _MEIPASS_CERT if _BUNDLED_EXISTS else _original_where()
 
 # Override certifi's where function
 if hasattr(certifi, 'core'):
@@ -27,11 +31,17 @@ else:
     certifi.where = override_where
 
 # Set SSL certificate environment variable
-os.environ['SSL_CERT_FILE'] = certifi.where()
-os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
-
-# Configure SSL default context
-try:
-    ssl._create_default_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass 
\ No newline at end of file
+cert_path = override_where()
+os.environ['SSL_CERT_FILE'] = cert_path
+os.environ['REQUESTS_CA_BUNDLE'] = cert_path
+
+# Verified default context against the bundled certificates. A fresh context
+# per call: http.client mutates the one it gets (ALPN, client certs,
+# check_hostname), so a shared instance would leak one caller's settings
+def _default_https_context(*args, **kwargs):
+    """Return a new verified context, using the bundled certificates by default."""
+    if args or kwargs:
+        return ssl.create_default_context(*args, **kwargs)
+    return ssl.create_default_context(cafile=cert_path)
+
+ssl._create_default_https_context = _default_https_context
@@ -1,6 +1,9 @@
 from instagrapi import Client
 from typing import List, Dict, Optional, Tuple, Any
 import os
+import re
+import atexit
+import hashlib
 import yaml
 import logging
 from crypto_utils import PasswordManager
@@ -13,26 +16,143 @@ from functools import partial
 import shutil
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image
 from instagrapi.types import Media, UserShort
 from instagrapi.exceptions import ClientError, LoginRequired, ReloginAttemptExceeded, BadPassword
 # Import VerificationDialog dynamically when needed to avoid circular imports
 
+# Seconds before an alt account's cached posts are fetched again. Our own
+# reposts are added to the cache as they happen, so this only catches posts
+# made outside the app
+ALT_CACHE_TTL = 3600
+
+# Original media IDs that repost apps embed in captions
+_ID_RE = re.compile(r'ID:(\d+)')
+# Shortcode of a post, reel, story or IGTV URL
+_POST_URL_RE = re.compile(r'instagram.com/(?:p|reel|stories|tv)/([^/?]+)')
+
+def _caption_key(caption: str) -> bytes:
+    """Fixed-width fingerprint of a caption, used as its key in the alt posts caches."""
+    return hashlib.blake2b(caption.encode(), digest_size=16).digest()
+
+# Directories already created this session (absolute paths)
+_ensured_dirs = set()
+
+def ensure_dir(path: str) -> None:
+    """Create a directory once per session, skipping the filesystem call afterwards."""
+    # Key on the absolute path so equivalent relative spellings share an entry
+    abs_path = os.path.abspath(path)
+    if abs_path not in _ensured_dirs:
+        os.makedirs(abs_path, exist_ok=True)
+        _ensured_dirs.add(abs_path)
+
 # Custom exceptions
 class IPBlacklistError(Exception):
     """Raised when Instagram has blacklisted the user's IP address."""
     pass
 
+# Serializers for non-JSON types, keyed by exact type
+_ENCODERS = {datetime: datetime.isoformat}
+
+def _encoder_for(obj):
+    """Return the serializer for obj's type, or None if it has none."""
+    obj_type = type(obj)
+    try:
+        return _ENCODERS[obj_type]
+    except KeyError:
+        pass
+    # Handle HttpUrl objects by converting them to strings. Its concrete type
+    # differs across pydantic versions, so match by name once per type
+    if isinstance(obj, datetime):
+        encoder = datetime.isoformat
+    elif str(obj_type).find('HttpUrl') > -1:
+        encoder = str
+    else:
+        encoder = None
+    _ENCODERS[obj_type] = encoder
+    return encoder
+
 # Custom JSON encoder to handle datetime objects
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        # Handle HttpUrl objects by converting them to strings
-        if str(type(obj)).find('HttpUrl') > -1:
-            return str(obj)
+        encoder = _encoder_for(obj)
+        if encoder is not None:
+            return encoder(obj)
         return super().default(obj)
 
+# orjson serializes datetimes natively and is much faster than a JSONEncoder subclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _orjson_default(obj):
+    """Serialize the types orjson doesn't know, the way DateTimeEncoder does."""
+    encoder = _encoder_for(obj)
+    if encoder is not None:
+        return encoder(obj)
+    raise TypeError
+
+def _dumps_session(data) -> str:
+    """Serialize session settings to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, cls=DateTimeEncoder)
+
+def _loads_session(json_str: str):
+    """Parse session settings serialized by _dumps_session."""
+    if orjson is not None:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
+# RapidFuzz scores caption similarity in C++; difflib is the pure-Python fallback
+try:
+    from rapidfuzz import fuzz as rfuzz, process as rprocess
+except ImportError:
+    rfuzz = rprocess = None
+
+# Minimum caption similarity (0-100) for the fallback check to count a repost
+SIMILAR_CAPTION_SCORE = 90
+
+def _caption_similarity(caption: str, other: str) -> float:
+    """Return how similar two captions are on a 0-100 scale, or 0 below SIMILAR_CAPTION_SCORE."""
+    if rfuzz is not None:
+        # score_cutoff lets RapidFuzz stop early on clear mismatches
+        return rfuzz.ratio(caption, other, score_cutoff=SIMILAR_CAPTION_SCORE)
+    from difflib import SequenceMatcher
+    score = SequenceMatcher(None, caption, other).ratio() * 100
+    return score if score >= SIMILAR_CAPTION_SCORE else 0
+
+def _similar_captions(caption: str, candidates: List[str]) -> List[Tuple[int, float]]:
+    """Return (index, score) for every candidate at least SIMILAR_CAPTION_SCORE similar to caption."""
+    if rprocess is not None:
+        # One call scores the whole batch inside RapidFuzz
+        matches = rprocess.extract(
+            caption, candidates, scorer=rfuzz.ratio,
+            score_cutoff=SIMILAR_CAPTION_SCORE, limit=None
+        )
+        return [(index, score) for _, score, index in matches]
+    scores = ((index, _caption_similarity(caption, other)) for index, other in enumerate(candidates))
+    return [(index, score) for index, score in scores if score]
+
+def _write_session_file(path: str, data: dict) -> None:
+    """Write a session file wrapper as compact JSON.
+    
+    Goes through a temp file and os.replace so a crash mid-write never leaves a
+    truncated session behind (which would force a full re-login).
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data) if orjson is not None else json.dumps(data).encode())
+    os.replace(tmp_path, path)
+
+def _read_session_file(path: str) -> dict:
+    """Read a session file wrapper written by _write_session_file (or older builds)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -44,8 +164,9 @@ class InstagramClient(Client):
         self.username = username
         self.verification_handler = verification_handler
         self.verification_code = None
-        self.verification_event = threading.Event()
         self.password_manager = PasswordManager()
+        # Digest of the settings last written to each user's session file
+        self._last_session_hash = {}
         
         # Set minimal timeouts and delays for faster operation
         self.delay_range = [0.1, 0.3]  # Further reduced from [0.2, 0.5]
@@ -60,6 +181,23 @@ class InstagramClient(Client):
         self.inject_sessionid_to_public = True  # Use sessionid for public requests too
         self.max_connection_attempts = 1  # Don't retry connections too many times
         
+        # Keep-alive pools so the many requests of a login + media fetch reuse
+        # TCP/TLS connections; retries are handled by our own code
+        for session in (self.private, self.public):
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+        
+    @property
+    def verification_event(self):
+        """Event signalled when a verification code is entered, created on first use.
+        
+        Most clients never hit a challenge, so the Event isn't built up front.
+        """
+        event = self.__dict__.get("_verification_event")
+        if event is None:
+            # setdefault keeps this race-free if two threads get here together
+            event = self.__dict__.setdefault("_verification_event", threading.Event())
+        return event
+        
     def challenge_code_handler(self, username, choice):
         """Override the default challenge code handler."""
         if self.verification_handler:
@@ -104,8 +242,7 @@ class InstagramClient(Client):
                 logger.error("Cannot save session: username not set")
                 return False
                 
-            if not os.path.exists("sessions"):
-                os.makedirs("sessions")
+            os.makedirs("sessions", exist_ok=True)
             
             session_file = f"sessions/{self.username}.json"
             
@@ -113,7 +250,13 @@ class InstagramClient(Client):
             session_data = self.get_settings()
             
             # Convert to JSON string
-            json_str = json.dumps(session_data, cls=DateTimeEncoder)
+            json_str = _dumps_session(session_data)
+            
+            # Skip the encrypt + write when nothing changed since our last save
+            digest = hashlib.blake2b(json_str.encode(), digest_size=16).hexdigest()
+            if self._last_session_hash.get(self.username) == digest and os.path.exists(session_file):
+                logger.debug(f"Session for {self.username} unchanged, not rewriting")
+                return True
             
             # Encrypt the data
             encrypted_data = self.password_manager.encrypt_password(json_str)
@@ -125,8 +268,8 @@ class InstagramClient(Client):
             }
             
             # Write to file
-            with open(session_file, "w") as f:
-                json.dump(encrypted_file, f, indent=2)
+            _write_session_file(session_file, encrypted_file)
+            self._last_session_hash[self.username] = digest
                 
             logger.info(f"Saved encrypted session for {self.username}")
             return True
@@ -140,16 +283,15 @@ class InstagramClient(Client):
         try:
             if not self.username:
                 logger.error("Cannot load session: username not set")
-            return False
+                return False
                 
             session_file = f"sessions/{self.username}.json"
-            if not os.path.exists(session_file):
+            try:
+                file_data = _read_session_file(session_file)
+            except FileNotFoundError:
                 logger.info(f"No session file found for {self.username}")
                 return False
                 
-            with open(session_file, "r") as f:
-                file_data = json.load(f)
-                
             # Check if file is encrypted
             if "encrypted_data" in file_data:
                 # Decrypt the data
@@ -157,7 +299,7 @@ class InstagramClient(Client):
                 json_str = self.password_manager.decrypt_password(encrypted_data)
                 
                 # Parse the decrypted JSON
-                session_data = json.loads(json_str)
+                session_data = _loads_session(json_str)
                 
                 # Load the settings into the client
                 self.set_settings(session_data)
@@ -256,6 +398,7 @@ class InstagramReposter:
         self.config_path = config_path
         self.password_manager = PasswordManager()
         self.config = self._load_config()
+        self._index_accounts()
         self.parent = parent
         self.media_cache = {}
         self.alt_media_cache = {}
@@ -263,8 +406,26 @@ class InstagramReposter:
         self.main_client = None
         self.alt_clients = []
         self.cache_lock = threading.Lock()  # Lock for thread-safe cache access
+        # Reverse lookups from cached alt posts to the usernames that posted them
+        self.caption_to_users = {}
+        self.media_id_to_users = {}
+        self.thumb_to_users = {}
         self.repost_status_changed = False  # Flag to indicate repost status has changed
         
+        # Shared worker pool for API calls that need a timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="reposter-api"
+        )
+        atexit.register(self._executor.shutdown, wait=False)
+        
+        # Per-account alt cache refreshes, which themselves wait on self._executor
+        self._cache_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="reposter-cache"
+        )
+        atexit.register(self._cache_executor.shutdown, wait=False)
+        # In-flight _cache_alt_posts futures by username, so one account is never fetched twice at once
+        self._cache_fetches = {}
+        
         try:
             if selected_main_account:
                 self.main_client = self._login_selected_main(selected_main_account)
@@ -278,6 +439,8 @@ class InstagramReposter:
 
     def _load_config(self) -> dict:
         """Load configuration from JSON file."""
+        # Decrypted passwords belong to the config being replaced
+        self._pw_cache = {}
         try:
             # Default empty config structure
             default_config = {
@@ -306,8 +469,23 @@ class InstagramReposter:
             logger.error(f"Failed to load config: {str(e)}")
             raise
 
+    def _index_accounts(self):
+        """Rebuild the username -> account lookup from the current config.
+        
+        Every config change goes through _save_config, which calls this, so
+        the index never lags behind self.config.
+        """
+        index = {}
+        if self.config["main_account"]:
+            index[self.config["main_account"]["username"]] = self.config["main_account"]
+        for account in self.config["alt_accounts"]:
+            # The main account wins if it is also listed as an alt
+            index.setdefault(account["username"], account)
+        self._accounts_by_username = index
+
     def _save_config(self):
         """Save configuration with encrypted passwords."""
+        self._index_accounts()
         try:
             self.password_manager.save_encrypted_config(self.config, self.config_path)
         except Exception as e:
@@ -316,55 +494,46 @@ class InstagramReposter:
 
     def get_available_accounts(self) -> List[str]:
         """Get list of all available accounts."""
-        accounts = []
-        if self.config["main_account"]:
-            accounts.append(self.config["main_account"]["username"])
-        for account in self.config["alt_accounts"]:
-            accounts.append(account["username"])
-        return accounts
+        # The index is built main account first, then alts in config order
+        return list(self._accounts_by_username)
 
     def get_accounts(self) -> List[Dict]:
         """Get list of all accounts with their details."""
         accounts = []
         
-        # Add main account if it exists
-        if self.config["main_account"]:
-            main_account = self.config["main_account"].copy()
-            # Check if this account is logged in
-            main_account["is_logged_in"] = (
-                self.main_client is not None and 
-                self.main_client.username == main_account["username"]
-            )
-            accounts.append(main_account)
+        # Add main account if it exists; each entry is a fresh dict so callers
+        # can't mutate the config through it
+        main_account = self.config["main_account"]
+        if main_account:
+            main_client = self.main_client
+            accounts.append({
+                **main_account,
+                "is_logged_in": main_client is not None and main_client.username == main_account["username"],
+            })
         
-        # Add alt accounts
-        for account in self.config["alt_accounts"]:
-            account_copy = account.copy()
-            # Check if this account is logged in as an alt client
-            account_copy["is_logged_in"] = any(
-                client is not None and client.username == account["username"] 
-                for client in self.alt_clients
-            )
-            accounts.append(account_copy)
+        # Add alt accounts, checking logins against a set built once
+        logged_in = {client.username for client in self.alt_clients if client is not None}
+        accounts.extend(
+            {**account, "is_logged_in": account["username"] in logged_in}
+            for account in self.config["alt_accounts"]
+        )
             
         return accounts
 
+    def _decrypt_password(self, encrypted_password: str) -> str:
+        """Decrypt a config password, reusing earlier results for the same token."""
+        password = self._pw_cache.get(encrypted_password)
+        if password is None:
+            password = self._pw_cache.setdefault(
+                encrypted_password, self.password_manager.decrypt_password(encrypted_password)
+            )
+        return password
+        
     def _login_selected_main(self, username: str) -> InstagramClient:
         """Login to the selected main account."""
         try:
-            # Ensure username exists in accounts
-            account = None
-            
-            # Check if it's the main account
-            if self.config["main_account"] and self.config["main_account"]["username"] == username:
-                account = self.config["main_account"]
-            
-            # Check if it's an alt account
-            if not account:
-                for alt in self.config["alt_accounts"]:
-                    if alt["username"] == username:
-                        account = alt
-                        break
+            # Ensure username exists in accounts (main or alt)
+            account = self._accounts_by_username.get(username)
             
             if not account:
                 logger.error(f"Account {username} not found in config")
@@ -379,7 +548,7 @@ class InstagramReposter:
             password = None
             try:
                 encrypted_password = account["password"]
-                password = self.password_manager.decrypt_password(encrypted_password)
+                password = self._decrypt_password(encrypted_password)
                 logger.info(f"Successfully decrypted password for {username}")
             except Exception as e:
                 logger.error(f"Failed to decrypt password for {username}: {str(e)}")
@@ -406,75 +575,47 @@ class InstagramReposter:
         try:
             self.alt_clients = []
             
-            # If there's a main username, add other accounts as alts
-            if main_username:
-                # Add the configured main account if it's not the main username
-                if self.config["main_account"] and self.config["main_account"]["username"] != main_username:
-                    try:
-                        main_account = self.config["main_account"]
-                        # Decrypt password
-                        password = None
-                        if "password" in main_account:
-                            encrypted_password = main_account["password"]
-                            password = self.password_manager.decrypt_password(encrypted_password)
-                            
-                        main_client = self._login(main_account["username"], password)
-                        if main_client:
-                            self.alt_clients.append(main_client)
-                    except Exception as e:
-                        logger.error(f"Failed to add main account as alt client: {str(e)}")
-                
-                # Add all other alt accounts (except the one that's now main)
-                for account in self.config["alt_accounts"]:
-                    if account["username"] != main_username:
-                        try:
-                            # Decrypt password
-                            password = None
-                            if "password" in account:
-                                encrypted_password = account["password"]
-                                password = self.password_manager.decrypt_password(encrypted_password)
-                                
-                            alt_client = self._login(account["username"], password)
-                            if alt_client:
-                                self.alt_clients.append(alt_client)
-                        except Exception as e:
-                            logger.error(f"Failed to add alt client {account['username']}: {str(e)}")
-            else:
-                # If no main username, just add all alt accounts
-                if self.config["main_account"]:
-                    try:
-                        main_account = self.config["main_account"]
-                        # Decrypt password
-                        password = None
-                        if "password" in main_account:
-                            encrypted_password = main_account["password"]
-                            password = self.password_manager.decrypt_password(encrypted_password)
-                            
-                        main_client = self._login(main_account["username"], password)
-                        if main_client:
-                            self.alt_clients.append(main_client)
-                    except Exception as e:
-                        logger.error(f"Failed to add main account as alt client: {str(e)}")
-                
-                # Add all alt accounts
-                for account in self.config["alt_accounts"]:
-                    try:
-                        # Decrypt password
-                        password = None
-                        if "password" in account:
-                            encrypted_password = account["password"]
-                            password = self.password_manager.decrypt_password(encrypted_password)
-                            
-                        alt_client = self._login(account["username"], password)
-                        if alt_client:
-                            self.alt_clients.append(alt_client)
-                    except Exception as e:
-                        logger.error(f"Failed to add alt client {account['username']}: {str(e)}")
+            # The configured main account is used as an alt unless it is the main username,
+            # followed by every alt account except the one that's now main
+            accounts = []
+            if self.config["main_account"] and self.config["main_account"]["username"] != main_username:
+                accounts.append(self.config["main_account"])
+            accounts.extend(
+                account for account in self.config["alt_accounts"]
+                if not main_username or account["username"] != main_username
+            )
+            
+            # Decrypt passwords up front; this is cheap next to a login
+            creds = []
+            for account in accounts:
+                # Nothing to decrypt or log in with for a blank password
+                if not account.get("password"):
+                    logger.debug(f"No password stored for {account['username']}, skipping")
+                    continue
+                try:
+                    password = self._decrypt_password(account["password"])
+                    creds.append((account["username"], password))
+                except Exception as e:
+                    logger.error(f"Failed to add alt client {account['username']}: {str(e)}")
+            
+            # Logins are network-bound, so run them concurrently and keep config order
+            if creds:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(16, len(creds))) as executor:
+                    clients = list(executor.map(lambda cred: self._login_alt(*cred), creds))
+                self.alt_clients = [client for client in clients if client]
             
             logger.info(f"Initialized {len(self.alt_clients)} alternative accounts")
         except Exception as e:
             logger.error(f"Error initializing alternative accounts: {str(e)}")
             self.alt_clients = []
+            
+    def _login_alt(self, username: str, password: str) -> "InstagramClient":
+        """Log in an alt account, logging instead of raising on failure."""
+        try:
+            return self._login(username, password)
+        except Exception as e:
+            logger.error(f"Failed to add alt client {username}: {str(e)}")
+            return None
 
     def _login(self, username: str, password: str = None) -> "InstagramClient":
         """Internal method to log in to Instagram.
@@ -501,134 +642,142 @@ class InstagramReposter:
             verification_handler=self.verification_handler
         )
         
+        # Reuse a saved session when it is still valid; this skips the whole
+        # password/challenge flow and is far faster than a fresh login
+        if client.load_session():
+            try:
+                client.get_account_info()
+                logger.info(f"Resumed saved session for {username}")
+                return client
+            except Exception as e:
+                logger.info(f"Saved session for {username} is no longer valid, logging in: {str(e)}")
+                # Start from a clean client rather than the stale session settings
+                client = InstagramClient(
+                    username=username, 
+                    verification_handler=self.verification_handler
+                )
+        
         try:
             # Login with password
             client.login(password)
             logger.info(f"Successfully logged in as {username}")
+            # Keep the session so the next login can resume it
+            client.save_session()
             return client
         except Exception as e:
             logger.warning(f"Login failed for {username}: {str(e)}")
             return None
 
+    def _retry_io(self, client, fn, args=(), timeouts=(12, 12, 12, 15), sleep=2):
+        """Run fn(*args) on the shared executor, one attempt per timeout in timeouts.
+        
+        Waits sleep seconds between attempts and reconnects the client before the
+        last one. A timed-out call keeps running in the pool without blocking us.
+        Returns fn's result, or raises the last error once every attempt failed.
+        """
+        attempts = len(timeouts)
+        last_error = None
+        for attempt, timeout in enumerate(timeouts, 1):
+            if attempt > 1:
+                time.sleep(sleep)
+                if attempt == attempts and self.reconnect_client(client):
+                    logger.info(f"Reconnected {client.username}, trying one final time")
+            try:
+                return self._executor.submit(fn, *args).result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                last_error = TimeoutError(f"timed out after {timeout} seconds")
+            except Exception as e:
+                last_error = e
+            logger.warning(f"{fn.__name__} for {client.username} failed (attempt {attempt}/{attempts}): {str(last_error)}")
+        raise last_error
+
+    @staticmethod
+    def _empty_alt_cache() -> Dict[str, set]:
+        """Return an empty alt posts cache; each field is a set used for membership tests."""
+        return {'captions': set(), 'media_ids': set(), 'original_media_ids': set(), 'thumbnail_urls': set()}
+        
     def _cache_alt_posts(self, client):
-        """Cache recent posts from an alt account with improved detection."""
+        """Cache recent posts from an alt account with improved detection.
+        
+        Returns None when the posts couldn't be fetched, so the account's entry
+        stays stale and is retried on the next check instead of being cached empty.
+        """
         try:
             # Skip if client has no username
             if not client.username:
                 logger.warning("Client has no username, skipping cache update")
-                return {'captions': {}, 'media_ids': {}, 'original_media_ids': {}, 'thumbnail_urls': {}}
+                return None
                 
             # Use the more efficient v1 API directly
             logger.info(f"Caching posts for {client.username}")
             start_time = time.time()
             
-            # Implement retry mechanism for API errors
-            max_retries = 3
-            retry_count = 0
-            medias = []
-            last_error = None
-            
-            while retry_count <= max_retries and not medias:
-                try:
-                    # Use a timeout to prevent hanging
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        # Reduce the number of posts to fetch for faster response
-                        future = executor.submit(client.user_medias_v1, client.user_id, 15)  # Reduced from 20 to 15
-                        try:
-                            # Increased timeout from 8 to 12 seconds
-                            medias = future.result(timeout=12)
-                            logger.info(f"Fetched {len(medias)} media items for {client.username} in {time.time() - start_time:.2f}s")
-                            break  # Success, exit retry loop
-                        except concurrent.futures.TimeoutError:
-                            retry_count += 1
-                            last_error = "timeout"
-                            logger.warning(f"Media fetch for {client.username} timed out after 12 seconds (attempt {retry_count}/{max_retries+1})")
-                            if retry_count <= max_retries:
-                                # Wait a bit longer between retries
-                                time.sleep(2)  # Increased from 1 to 2 seconds
-                                continue
-                            else:
-                                logger.error(f"Media fetch for {client.username} timed out after all retries")
-                                # Try to reconnect
-                                if self.reconnect_client(client):
-                                    logger.info(f"Reconnected {client.username}, trying one final time")
-                                    try:
-                                        # One final attempt after reconnect with longer timeout
-                                        future = executor.submit(client.user_medias_v1, client.user_id, 15)
-                                        medias = future.result(timeout=15)  # Even longer timeout for final try
-                                        logger.info(f"Fetched {len(medias)} media items after reconnect")
-                                    except Exception as e:
-                                        logger.error(f"Still failed after reconnect: {str(e)}")
-                                        return {'captions': {}, 'media_ids': {}, 'original_media_ids': {}, 'thumbnail_urls': {}}
-                except Exception as e:
-                    retry_count += 1
-                    last_error = str(e)
-                    logger.warning(f"Error fetching media for {client.username} (attempt {retry_count}/{max_retries+1}): {str(e)}")
-                    if retry_count <= max_retries:
-                        time.sleep(2)  # Increased wait time between retries
-                        continue
-                    else:
-                        logger.error(f"Failed to get media after all retries: {str(e)}")
-                        return {'captions': {}, 'media_ids': {}, 'original_media_ids': {}, 'thumbnail_urls': {}}
+            # Fetch with retries; reduced from 20 to 15 posts for faster response
+            try:
+                medias = self._retry_io(client, client.user_medias_v1, (client.user_id, 15))
+            except Exception as e:
+                logger.error(f"Failed to get media for {client.username} after all retries: {str(e)}")
+                return None
+            logger.info(f"Fetched {len(medias)} media items for {client.username} in {time.time() - start_time:.2f}s")
             
-            # If we still don't have any media after retries, return empty cache
+            # Nothing posted yet (or nothing visible): a real result, cached as empty
             if not medias:
-                logger.warning(f"No media found for {client.username} after retries. Last error: {last_error}")
-                return {'captions': {}, 'media_ids': {}, 'original_media_ids': {}, 'thumbnail_urls': {}}
+                logger.warning(f"No media found for {client.username}")
+                return self._empty_alt_cache()
             
             # Create a more comprehensive cache structure
-            cache = {
-                'captions': {},
-                'media_ids': {},
-                'original_media_ids': {},
-                'thumbnail_urls': {}
-            }
+            cache = self._empty_alt_cache()
             
             # Process media with a timeout to prevent hanging on large collections
             start_process_time = time.time()
             max_process_time = 8  # Increased from 5 to 8 seconds
             
+            # Bind the target sets and loop invariants once instead of per media
+            captions = cache['captions']
+            media_ids = cache['media_ids']
+            thumbnail_urls = cache['thumbnail_urls']
+            original_media_ids = cache['original_media_ids']
+            log_captions = logger.isEnabledFor(logging.DEBUG)
+            username = client.username
+            
             for media in medias:
                 # Check if we've exceeded the maximum processing time
                 if time.time() - start_process_time > max_process_time:
-                    logger.warning(f"Processing media for {client.username} is taking too long, stopping early")
+                    logger.warning(f"Processing media for {username} is taking too long, stopping early")
                     break
-                    
-                # Cache by caption
+                
+                # Read each media attribute once
                 caption = (media.caption_text or "").strip()
+                media_id = str(media.pk)
+                thumbnail_url = getattr(media, 'thumbnail_url', None)
+                
+                # Cache by caption
                 if caption:
-                    # Store the actual caption text as the key for exact matching
-                    cache['captions'][caption] = True
+                    # Store a fingerprint of the caption for exact matching, so lookups
+                    # never rehash or compare long captions
+                    captions.add(_caption_key(caption))
                     # Log the caption being cached for debugging
-                    logger.info(f"Caching caption for {client.username}: '{caption[:50]}...' (truncated)")
+                    if log_captions:
+                        logger.debug("Caching caption for %s: '%.50s...' (truncated)", username, caption)
+                    
+                    # Try to extract original media ID from caption if it contains it
+                    # Some repost apps add the original media ID in the caption
+                    if "ID:" in caption:
+                        original_media_ids.update(_ID_RE.findall(caption))
                     
                 # Cache by media ID
-                media_id = str(media.pk)
-                cache['media_ids'][media_id] = True
+                media_ids.add(media_id)
                 
                 # Cache thumbnail URL if available
-                if hasattr(media, 'thumbnail_url') and media.thumbnail_url:
-                    thumbnail_url = str(media.thumbnail_url)
-                    cache['thumbnail_urls'][thumbnail_url] = True
-                
-                # Try to extract original media ID from caption if it contains it
-                # Some repost apps add the original media ID in the caption
-                if caption and "ID:" in caption:
-                    try:
-                        # Extract potential media IDs from caption
-                        import re
-                        id_matches = re.findall(r'ID:(\d+)', caption)
-                        for id_match in id_matches:
-                            cache['original_media_ids'][id_match] = True
-                    except:
-                        pass
+                if thumbnail_url:
+                    thumbnail_urls.add(str(thumbnail_url))
             
             logger.info(f"Cached {len(cache['captions'])} captions, {len(cache['media_ids'])} media IDs, and {len(cache['thumbnail_urls'])} thumbnail URLs for {client.username}")
             return cache
             
         except Exception as e:
             logger.error(f"Error in _cache_alt_posts for {client.username}: {str(e)}")
-            return {'captions': {}, 'media_ids': {}, 'original_media_ids': {}, 'thumbnail_urls': {}}
+            return None
 
     def check_repost_status(self, media):
         """Check if media has been reposted by any alt account using multiple detection methods."""
@@ -636,138 +785,224 @@ class InstagramReposter:
             caption = getattr(media, "caption_text", "") or ""
             caption = caption.strip()
             media_id = str(getattr(media, "pk", "unknown"))
-            reposted_accounts = []
-            
-            # Initialize alt_posts_cache if it doesn't exist
-            if not hasattr(self, "alt_posts_cache"):
-                self.alt_posts_cache = {}
-                logger.info("Created missing alt_posts_cache")
             
             # Skip if no alt clients
             if not self.alt_clients:
-                return reposted_accounts
+                return []
                 
             # Skip if no caption (can't reliably check repost status without caption)
             if not caption:
                 logger.info(f"Media {media_id} has no caption, skipping repost check")
-                return reposted_accounts
-            
-            # Force cache refresh if it's older than 5 minutes or doesn't exist
-            current_time = time.time()
-            cache_needs_update = False
-            
-            for client in self.alt_clients:
-                # Skip clients with no username
-                if not client.username:
-                    logger.warning("Found client with no username, skipping")
-                    continue
-                    
-                with self.cache_lock:
-                    if (client.username not in self.alt_posts_cache or
-                        current_time - self.alt_posts_cache.get(f"{client.username}_timestamp", 0) > 300):
-                        cache_needs_update = True
-                        break
-            
-            # Update cache if needed
-            if cache_needs_update:
-                logger.info("Cache needs update, refreshing alt posts cache")
-                # Use a thread pool to check all accounts in parallel with timeout
-                with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                    futures = {}
-                    
-                    for client in self.alt_clients:
-                        # Skip clients with no username
-                        if not client.username:
-                            logger.warning("Found client with no username, skipping cache update")
-                            continue
-                            
-                        # Submit cache update task
-                        futures[executor.submit(self._cache_alt_posts, client)] = client.username
-                    
-                    # Wait for all cache updates to complete with timeout - 15 seconds total
-                    try:
-                        for future in concurrent.futures.as_completed(futures, timeout=15):
-                            client_username = futures[future]
-                            try:
-                                result = future.result()
-                                with self.cache_lock:
-                                    self.alt_posts_cache[client_username] = result
-                                    self.alt_posts_cache[f"{client_username}_timestamp"] = current_time
-                                    logger.info(f"Updated cache for {client_username}")
-                            except Exception as e:
-                                logger.warning(f"Failed to update cache for {client_username}: {str(e)}")
-                    except concurrent.futures.TimeoutError:
-                        logger.warning("Some cache updates timed out, proceeding with available data")
+                return []
             
-            # Check if we have any valid cache data
-            valid_cache_exists = False
-            for client in self.alt_clients:
-                if client.username in self.alt_posts_cache and self.alt_posts_cache[client.username].get('captions'):
-                    valid_cache_exists = True
-                    break
-                    
             # If no valid cache exists, try a direct API approach as fallback
-            if not valid_cache_exists:
+            if not self._refresh_alt_posts_cache():
                 logger.warning("No valid cache data available, using fallback repost detection")
                 return self._fallback_repost_check(media)
             
-            # Now check if caption exists in any of the cached posts
-            for client in self.alt_clients:
-                # Skip clients with no username
-                if not client.username:
-                    logger.warning("Found client with no username, skipping repost check")
-                    continue
-                    
-                with self.cache_lock:
-                    if client.username in self.alt_posts_cache:
-                        cache = self.alt_posts_cache[client.username]
-                        
-                        # Skip if cache is empty (likely due to API error)
-                        if not cache or not cache.get('captions'):
-                            logger.warning(f"Cache for {client.username} is empty, skipping repost check")
-                            continue
-                        
-                        # Check by exact caption match
-                        if caption in cache.get('captions', {}):
-                            logger.info(f"Found exact caption match for {media_id} in {client.username}")
-                            reposted_accounts.append(client.username)
-                            continue
-                        
-                        # Also check by media ID if available
-                        if media_id in cache.get('media_ids', {}):
-                            logger.info(f"Found media ID match for {media_id} in {client.username}")
-                            reposted_accounts.append(client.username)
-                            continue
-                            
-                        # Check by original media ID
-                        if media_id in cache.get('original_media_ids', {}):
-                            logger.info(f"Found original media ID match for {media_id} in {client.username}")
-                            reposted_accounts.append(client.username)
-                            continue
-                            
-                        # Check for media URL or thumbnail URL match
-                        if hasattr(media, 'thumbnail_url') and media.thumbnail_url:
-                            thumbnail_url = str(media.thumbnail_url)
-                            if thumbnail_url in cache.get('thumbnail_urls', {}):
-                                logger.info(f"Found thumbnail URL match for {media_id} in {client.username}")
-                                reposted_accounts.append(client.username)
-                                continue
-            
-            if reposted_accounts:
-                # Filter out any None values that might have slipped through
-                reposted_accounts = [account for account in reposted_accounts if account is not None]
-                if reposted_accounts:  # Check again after filtering
-                    logger.info(f"Media {media_id} has been reposted to: {', '.join(reposted_accounts)}")
-            else:
-                logger.info(f"Repost status for {media_id}: No reposts found")
-            
-            return reposted_accounts
+            return self._match_reposts(media)
             
         except Exception as e:
             logger.error(f"Error checking repost status: {str(e)}")
             # Return empty list instead of raising exception
             return []
 
+    def check_repost_status_bulk(self, medias) -> Dict:
+        """Check repost status for many media at once.
+        
+        Refreshes the alt posts cache at most once and then matches every media
+        against it in memory.
+        
+        Returns:
+            Dict mapping media pk to the list of alt usernames it was reposted to.
+        """
+        results = {}
+        try:
+            if not self.alt_clients:
+                return {media.pk: [] for media in medias}
+            
+            valid_cache_exists = self._refresh_alt_posts_cache()
+            if not valid_cache_exists:
+                logger.warning("No valid cache data available, using fallback repost detection")
+            
+            for media in medias:
+                try:
+                    caption = (getattr(media, "caption_text", "") or "").strip()
+                    if not caption:
+                        results[media.pk] = []
+                    elif valid_cache_exists:
+                        results[media.pk] = self._match_reposts(media)
+                    else:
+                        results[media.pk] = self._fallback_repost_check(media)
+                except Exception as e:
+                    logger.warning(f"Failed to check repost status for media {getattr(media, 'pk', 'unknown')}: {str(e)}")
+                    results[media.pk] = []
+        except Exception as e:
+            logger.error(f"Error checking repost status in bulk: {str(e)}")
+        
+        return results
+
+    def _refresh_alt_posts_cache(self) -> bool:
+        """Refresh stale alt posts caches and report whether any usable cache exists."""
+        # Initialize alt_posts_cache if it doesn't exist
+        if not hasattr(self, "alt_posts_cache"):
+            self.alt_posts_cache = {}
+            logger.info("Created missing alt_posts_cache")
+        
+        # Refresh caches that are older than ALT_CACHE_TTL or don't exist
+        current_time = time.monotonic()
+        stale_clients = []
+        
+        for client in self.alt_clients:
+            # Skip clients with no username
+            if not client.username:
+                logger.warning("Found client with no username, skipping")
+                continue
+                
+            with self.cache_lock:
+                timestamp, cache = self.alt_posts_cache.get(client.username, (0, None))
+            if cache is None or current_time - timestamp > ALT_CACHE_TTL:
+                stale_clients.append(client)
+        
+        if stale_clients:
+            logger.info(f"Cache needs update, refreshing alt posts cache for {len(stale_clients)} accounts")
+            self._refresh_all_alt_caches(stale_clients)
+        
+        # Check if we have any valid cache data
+        with self.cache_lock:
+            for client in self.alt_clients:
+                entry = self.alt_posts_cache.get(client.username)
+                if entry and entry[1].get('captions'):
+                    return True
+        return False
+
+    def _refresh_all_alt_caches(self, clients) -> None:
+        """Fetch the recent posts of every given alt client in parallel and store them.
+        
+        Waits up to 15 seconds in total, which is shorter than one of _retry_io's
+        retry cycles, so retries and reconnects happen after this returns. A fetch
+        that takes longer keeps running and stores its result when it finishes;
+        until then, later calls reuse it rather than starting another fetch for
+        the same account.
+        """
+        futures = []
+        started = []
+        with self.cache_lock:
+            for client in clients:
+                future = self._cache_fetches.get(client.username)
+                if future is None:
+                    # Each _cache_alt_posts call waits on its own fetch in self._executor, so
+                    # the per-client tasks run on a separate pool to keep them from starving it
+                    future = self._cache_executor.submit(self._cache_alt_posts, client)
+                    self._cache_fetches[client.username] = future
+                    started.append((client.username, future))
+                futures.append(future)
+        
+        # Registered outside the lock: a callback on an already finished future runs right away
+        for username, future in started:
+            future.add_done_callback(partial(self._store_alt_cache, username))
+        
+        _, pending = concurrent.futures.wait(futures, timeout=15)
+        if pending:
+            logger.warning(f"{len(pending)} cache updates still running, proceeding with available data")
+
+    def _store_alt_cache(self, username: str, future) -> None:
+        """Done-callback for a _cache_alt_posts future: store its result and clear it as in flight."""
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Failed to update cache for {username}: {str(e)}")
+            result = None
+        with self.cache_lock:
+            self._cache_fetches.pop(username, None)
+            if result is not None:
+                self.alt_posts_cache[username] = (time.monotonic(), result)
+                self._rebuild_repost_index()
+        if result is not None:
+            logger.info(f"Updated cache for {username}")
+
+    def _rebuild_repost_index(self) -> None:
+        """Rebuild the reverse lookups from every alt posts cache. Caller holds cache_lock."""
+        self.caption_to_users = {}
+        self.media_id_to_users = {}
+        self.thumb_to_users = {}
+        for username, (_, cache) in self.alt_posts_cache.items():
+            # Skip empty caches (likely due to API error), they never match
+            if not cache or not cache.get('captions'):
+                continue
+            # A media ID matches whether it was posted directly or named in a caption
+            self._index_alt_posts(
+                username, cache['captions'],
+                cache['media_ids'] | cache['original_media_ids'], cache['thumbnail_urls']
+            )
+
+    def _index_alt_posts(self, username, captions, media_ids, thumbnail_urls) -> None:
+        """Add one alt account's posts to the reverse lookups. Caller holds cache_lock."""
+        for index, keys in ((self.caption_to_users, captions),
+                            (self.media_id_to_users, media_ids),
+                            (self.thumb_to_users, thumbnail_urls)):
+            for key in keys:
+                users = index.setdefault(key, [])
+                if username not in users:
+                    users.append(username)
+
+    def _record_repost(self, username: str, media) -> None:
+        """Add a media just uploaded to an alt account to its cache so it matches right away."""
+        caption = (getattr(media, "caption_text", "") or "").strip()
+        thumbnail_url = getattr(media, 'thumbnail_url', None)
+        media_id = str(media.pk)
+        captions = {_caption_key(caption)} if caption else set()
+        original_media_ids = set(_ID_RE.findall(caption)) if "ID:" in caption else set()
+        thumbnail_urls = {str(thumbnail_url)} if thumbnail_url else set()
+        
+        with self.cache_lock:
+            entry = self.alt_posts_cache.get(username)
+            if not entry:
+                # Not cached yet; the next refresh fetches it along with the rest
+                return
+            cache = entry[1]
+            # An account without captions was left out of the index, so index it whole
+            was_indexed = bool(cache['captions'])
+            cache['captions'] |= captions
+            cache['media_ids'].add(media_id)
+            cache['original_media_ids'] |= original_media_ids
+            cache['thumbnail_urls'] |= thumbnail_urls
+            if was_indexed:
+                self._index_alt_posts(username, captions, original_media_ids | {media_id}, thumbnail_urls)
+            elif cache['captions']:
+                self._index_alt_posts(
+                    username, cache['captions'],
+                    cache['media_ids'] | cache['original_media_ids'], cache['thumbnail_urls']
+                )
+        logger.info(f"Added new repost to cache for {username}")
+
+    def _match_reposts(self, media) -> List[str]:
+        """Match a media against the cached alt posts and return the matching usernames."""
+        # Fingerprinted once, the same way the cached captions are
+        caption = _caption_key((getattr(media, "caption_text", "") or "").strip())
+        media_id = str(getattr(media, "pk", "unknown"))
+        thumbnail_url = getattr(media, 'thumbnail_url', None)
+        
+        # A handful of lookups in the reverse indexes instead of scanning every cache
+        with self.cache_lock:
+            matched = set(self.caption_to_users.get(caption, ()))
+            matched.update(self.media_id_to_users.get(media_id, ()))
+            if thumbnail_url:
+                matched.update(self.thumb_to_users.get(str(thumbnail_url), ()))
+        
+        # Only report current alt clients, in their usual order
+        reposted_accounts = [
+            client.username for client in self.alt_clients
+            if client.username and client.username in matched
+        ]
+        
+        if reposted_accounts:
+            logger.info(f"Media {media_id} has been reposted to: {', '.join(reposted_accounts)}")
+        else:
+            logger.info(f"Repost status for {media_id}: No reposts found")
+        
+        return reposted_accounts
+
     def _fallback_repost_check(self, media):
         """Fallback method for repost detection when API fails."""
         try:
@@ -780,42 +1015,48 @@ class InstagramReposter:
                 
             logger.info(f"Using fallback repost detection for media {media_id}")
             
-            # Try to directly fetch a few recent posts from each alt account
+            # Try to directly fetch a few recent posts from each alt account. Exact
+            # matches are settled here; the rest are scored together afterwards
+            alt_index = []  # (username, caption) pairs still to be compared
             for client in self.alt_clients:
                 if not client.username:
                     continue
                     
                 try:
                     # Try to get just a few posts with a short timeout
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(client.user_medias_v1, client.user_id, 5)  # Just get 5 most recent
-                        try:
-                            alt_medias = future.result(timeout=5)  # Short 5 second timeout
-                            
-                            # Check each media
-                            for alt_media in alt_medias:
-                                alt_caption = (alt_media.caption_text or "").strip()
-                                
-                                # Direct caption comparison
-                                if caption == alt_caption:
-                                    logger.info(f"Fallback: Found exact caption match for {media_id} in {client.username}")
-                                    reposted_accounts.append(client.username)
-                                    break
-                                    
-                                # High similarity check
-                                elif alt_caption and len(alt_caption) > 10 and len(caption) > 10:
-                                    from difflib import SequenceMatcher
-                                    similarity = SequenceMatcher(None, caption, alt_caption).ratio()
-                                    if similarity > 0.9:
-                                        logger.info(f"Fallback: Found similar caption match ({similarity:.2f}) for {media_id} in {client.username}")
-                                        reposted_accounts.append(client.username)
-                                        break
-                        except concurrent.futures.TimeoutError:
-                            logger.warning(f"Fallback: Media fetch for {client.username} timed out")
-                            continue
+                    future = self._executor.submit(client.user_medias_v1, client.user_id, 5)  # Just get 5 most recent
+                    try:
+                        alt_medias = future.result(timeout=5)  # Short 5 second timeout
+                    except concurrent.futures.TimeoutError:
+                        logger.warning(f"Fallback: Media fetch for {client.username} timed out")
+                        continue
                 except Exception as e:
                     logger.warning(f"Fallback: Error checking {client.username}: {str(e)}")
                     continue
+                
+                alt_captions = [(alt_media.caption_text or "").strip() for alt_media in alt_medias]
+                
+                # Direct caption comparison
+                if caption in alt_captions:
+                    logger.info(f"Fallback: Found exact caption match for {media_id} in {client.username}")
+                    reposted_accounts.append(client.username)
+                    continue
+                
+                # Only longer captions are worth a similarity check
+                if len(caption) > 10:
+                    alt_index.extend(
+                        (client.username, alt_caption)
+                        for alt_caption in alt_captions if len(alt_caption) > 10
+                    )
+            
+            # High similarity check, across every remaining alt caption at once
+            if alt_index:
+                candidates = [alt_caption for _, alt_caption in alt_index]
+                for index, similarity in _similar_captions(caption, candidates):
+                    username = alt_index[index][0]
+                    if username not in reposted_accounts:
+                        logger.info(f"Fallback: Found similar caption match ({similarity:.0f}%) for {media_id} in {username}")
+                        reposted_accounts.append(username)
             
             if reposted_accounts:
                 logger.info(f"Fallback: Media {media_id} has been reposted to: {', '.join(reposted_accounts)}")
@@ -866,6 +1107,7 @@ class InstagramReposter:
                                     wrapped = MediaWrapper(media)
                                     wrapped.view_count = item.get('view_count', 0)
                                     wrapped.reposted_to = item.get('reposted_to', [])
+                                    wrapped.from_cache = True
                                     medias.append(wrapped)
                                 except Exception as e:
                                     logger.warning(f"Failed to load cached media item: {str(e)}")
@@ -924,6 +1166,9 @@ class InstagramReposter:
                     logger.warning("No media found after retries")
                     return []
                 
+                # Check repost status for the whole batch against one cache refresh
+                repost_status = self.check_repost_status_bulk(medias)
+                
                 # Process medias without additional API calls for each video
                 processed_medias = []
                 for media in medias:
@@ -941,11 +1186,7 @@ class InstagramReposter:
                         wrapped_media.view_count = 0
                     
                     # Add repost status to wrapped media object
-                    try:
-                        wrapped_media.reposted_to = self.check_repost_status(media)
-                    except Exception as e:
-                        logger.warning(f"Failed to check repost status for media {media.pk}: {str(e)}")
-                        wrapped_media.reposted_to = []
+                    wrapped_media.reposted_to = repost_status.get(media.pk, [])
                         
                     processed_medias.append(wrapped_media)
                 
@@ -1070,6 +1311,7 @@ class InstagramReposter:
                     try:
                         result = future.result(timeout=120)  # 2 minute timeout for upload
                         logger.info(f"Successfully reposted to {client.username} in {time.time() - start_time:.2f}s")
+                        self._record_repost(client.username, result)
                     except concurrent.futures.TimeoutError:
                         logger.error(f"Repost to {client.username} timed out after 120 seconds")
                         continue
@@ -1521,14 +1763,7 @@ class InstagramReposter:
             logger.info(f"Attempting to reconnect {username}")
             
             # Find account credentials
-            account = None
-            if self.config["main_account"] and self.config["main_account"]["username"] == username:
-                account = self.config["main_account"]
-            else:
-                account = next(
-                    (acc for acc in self.config["alt_accounts"] if acc["username"] == username),
-                    None
-                )
+            account = self._accounts_by_username.get(username)
                 
             if not account:
                 logger.warning(f"Cannot reconnect {username}: account not found in config")
@@ -1700,14 +1935,12 @@ class InstagramReposter:
         """
         try:
             # Extract media identifier from URL
-            import re
-            
             # Remove any @ from the beginning of the URL if present
             if url.startswith('@'):
                 url = url[1:]
                 
             # Match different Instagram URL patterns
-            match = re.search(r'instagram.com/(?:p|reel|stories|tv)/([^/?]+)', url)
+            match = _POST_URL_RE.search(url)
             
             if not match:
                 raise ValueError("Invalid Instagram URL. Please use a direct link to a post, reel, or story")
@@ -1798,16 +2031,16 @@ class InstagramReposter:
                     # Check if target_path is a directory or a file
                     if os.path.isdir(target_path) or not os.path.splitext(target_path)[1]:
                         # It's a directory or has no extension
-                        os.makedirs(target_path, exist_ok=True)
+                        ensure_dir(target_path)
                         output_path = os.path.join(target_path, f"downloaded_instagram_{shortcode}.txt")
                     else:
                         # It's a complete file path
-                        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                        ensure_dir(os.path.dirname(target_path))
                         output_path = target_path
                 else:
                     # Create a path in the local Downloads directory
                     download_dir = os.path.join("Downloads")
-                    os.makedirs(download_dir, exist_ok=True)
+                    ensure_dir(download_dir)
                     output_path = os.path.join(download_dir, f"downloaded_instagram_{shortcode}.txt")
                 
                 # Create a descriptive placeholder file
@@ -1840,18 +2073,18 @@ class InstagramReposter:
                 # Is it a directory?
                 if os.path.isdir(target_path) or not os.path.splitext(target_path)[1]:
                     # Target is a directory - let the API handle the filename
-                    os.makedirs(target_path, exist_ok=True)
+                    ensure_dir(target_path)
                     download_dir = target_path
                     filename = None  # Let Instagram API create the filename
                 else:
                     # Target is a file path - split into directory and filename
                     download_dir = os.path.dirname(target_path)
                     filename = os.path.basename(target_path)
-                    os.makedirs(download_dir, exist_ok=True)
+                    ensure_dir(download_dir)
             else:
                 # No target provided - use local Downloads folder
                 download_dir = os.path.join("Downloads")
-                os.makedirs(download_dir, exist_ok=True)
+                ensure_dir(download_dir)
                 filename = None  # Let Instagram API create the filename
             
             logger.info(f"Downloading media to directory: {download_dir}")
@@ -1916,8 +2149,24 @@ class InstagramReposter:
                             output_path = self.main_client.video_download(media_pk, folder=download_dir)
                 
                 elif media_type == 8:  # Album
-                    album_items = self.main_client.media_info(media_pk).get('resources', [])
-                    if album_items:
+                    album_info = self.main_client.media_info(media_pk)
+                    album_items = [
+                        item.dict() if hasattr(item, 'dict') else item
+                        for item in getattr(album_info, 'resources', None) or []
+                    ]
+                    if album_items and is_user_download and not filename:
+                        # Download every item of the album at once; the first one is the primary path
+                        base_name = f"{download_prefix}{username}_{shortcode}_album_{timestamp}"
+                        album_paths = self._download_album_items(album_items, download_dir, base_name)
+                        output_path = album_paths[0]
+                        logger.info(f"Successfully downloaded {len(album_paths)} album items to {download_dir}")
+                        return {
+                            'path': output_path,
+                            'paths': album_paths,
+                            'content_info': content_info,
+                            'success': True
+                        }
+                    elif album_items:
                         first_item = album_items[0]
                         first_item_pk = first_item['pk']
                         first_item_type = first_item.get('media_type', 1)
@@ -2001,6 +2250,45 @@ class InstagramReposter:
             logger.error(f"Error downloading content by URL: {str(e)}")
             raise
 
+    def _download_album_items(self, album_items: List[Dict], download_dir: str, base_name: str) -> List[str]:
+        """
+        Download all items of an album concurrently.
+        
+        Each item is a plain HTTPS fetch from the CDN, so the downloads run on a
+        thread pool and the total time is close to the slowest single item.
+        
+        Args:
+            album_items: Album resources as dictionaries
+            download_dir: Directory to save the files in
+            base_name: Filename prefix; the item index is appended to it
+            
+        Returns:
+            List of downloaded file paths, in album order
+        """
+        def download_item(index, item):
+            filename = f"{base_name}_{index + 1}"
+            video_url = item.get('video_url')
+            if item.get('media_type', 1) == 2 and video_url:
+                return str(self.main_client.video_download_by_url(str(video_url), filename, download_dir))
+            thumbnail_url = item.get('thumbnail_url')
+            if thumbnail_url:
+                return str(self.main_client.photo_download_by_url(str(thumbnail_url), filename, download_dir))
+            # No direct URL available - fall back to a lookup by media pk
+            return str(self.main_client.photo_download(item['pk'], folder=download_dir))
+        
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(album_items)))
+        futures = [executor.submit(download_item, i, item) for i, item in enumerate(album_items)]
+        try:
+            # result() re-raises the first failure so the caller writes its error file
+            return [future.result(timeout=60) for future in futures]
+        except Exception:
+            # Don't wait for the rest: drop queued items and let running ones finish alone
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False)
+
     def repost_content_by_url(self, url: str, caption: str = None, remove_watermark: bool = False, add_watermark: bool = False, credit_original: bool = True) -> Dict:
         """
         Download and repost Instagram content by URL.
@@ -2013,7 +2301,8 @@ class InstagramReposter:
             credit_original: Whether to credit the original creator
             
         Returns:
-            Dictionary with repost details
+            Dictionary with repost details. Expected failures are reported via
+            'success': False and an 'error' message rather than raised.
         """
         try:
             # First download the content
@@ -2027,6 +2316,7 @@ class InstagramReposter:
                 # Return informative error
                 return {
                     'success': False,
+                    'error': f"Could not download content: {message}",
                     'message': f"Could not download content: {message}",
                     'shortcode': download_result.get('content_info', {}).get('shortcode')
                 }
@@ -2058,7 +2348,10 @@ class InstagramReposter:
             
         except Exception as e:
             logger.error(f"Error reposting content by URL: {str(e)}")
-            raise
+            return {
+                'success': False,
+                'error': str(e)
+            }
 
     def repost_media(self, media_data: Dict) -> None:
         """
@@ -2158,6 +2451,8 @@ class MediaWrapper:
     def __init__(self, media):
         self._media = media
         self.reposted_to = []
+        # True when read back from the on-disk media cache, where reposted_to may be stale
+        self.from_cache = False
         
     def __getattr__(self, name):
         """Delegate attribute access to wrapped media object."""
@@ -2394,8 +2689,7 @@ def encrypt_existing_sessions():
             
             try:
                 # Read the file
-                with open(file_path, "r") as f:
-                    file_data = json.load(f)
+                file_data = _read_session_file(file_path)
                 
                 # Skip already encrypted files
                 if "encrypted_data" in file_data and "encryption_version" in file_data:
@@ -2403,7 +2697,7 @@ def encrypt_existing_sessions():
                     continue
                     
                 # Convert to JSON string
-                json_str = json.dumps(file_data, cls=DateTimeEncoder)
+                json_str = _dumps_session(file_data)
                 
                 # Encrypt the data
                 encrypted_data = password_manager.encrypt_password(json_str)
@@ -2419,8 +2713,7 @@ def encrypt_existing_sessions():
                 os.rename(file_path, backup_path)
                 
                 # Write encrypted data to original filename
-                with open(file_path, "w") as f:
-                    json.dump(encrypted_file, f, indent=2)
+                _write_session_file(file_path, encrypted_file)
                     
                 encrypted_count += 1
                 logger.info(f"Encrypted session file for {username}")